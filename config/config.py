@@ -37,9 +37,25 @@ CRAWLER_CONFIG = {
 # Data file paths
 CSV_PATH = DATA_DIR / "ITViec_data.csv"
 CLEAN_CSV_PATH = CLEAN_DATA_DIR / "clean_data.csv"
+CLEAN_PARQUET_PATH = CLEAN_DATA_DIR / "clean_data.parquet"
+RAW_MANIFEST_PATH = CLEAN_DATA_DIR / "raw_manifest.npz"
+SKILL_VOCABULARY_PATH = CLEAN_DATA_DIR / "skill_vocabulary.json"
+SALARY_SKETCHES_PATH = CLEAN_DATA_DIR / "salary_sketches.npz"
+# Posting keys (title + company + location) of the processed and raw datasets
+DEDUP_INDEX_PATH = CLEAN_DATA_DIR / "dedup_index.npz"
+RAW_DEDUP_INDEX_PATH = CLEAN_DATA_DIR / "raw_dedup_index.npz"
+RECOMMENDER_INDEX_PATH = MODELS_DIR / "job_recommender_lsh.npz"
+RECOMMENDER_ARTIFACTS_DIR = MODELS_DIR / "job_recommender"
 CURRENT_PAGE_FILE = BASE_DIR / "current_page.txt"
 ERROR_LOG_FILE = BASE_DIR / "error_log.txt"
 
+# Storage backend for processed data: "csv" or "parquet"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "csv")
+
+# Streaming (out-of-core) processing: raw rows per chunk and memory cap
+PROCESSING_CHUNK_SIZE = int(os.getenv("PROCESSING_CHUNK_SIZE", "50000"))
+PROCESSING_MEMORY_LIMIT_MB = int(os.getenv("PROCESSING_MEMORY_LIMIT_MB", "2048"))
+
 # NLP settings
 STOP_WORDS_VI = ["và", "của", "có", "được", "cho", "với", "trong", "tại", "về"]
 SKILL_CATEGORIES = {
@@ -49,6 +65,32 @@ SKILL_CATEGORIES = {
     "databases": ["mysql", "postgresql", "mongodb", "redis", "elasticsearch"],
 }
 
+# Alternative spellings of a skill -> canonical name (all lowercase)
+SKILL_SYNONYMS = {
+    "reactjs": "react", "react.js": "react",
+    "vuejs": "vue", "vue.js": "vue",
+    "next.js": "nextjs", "nuxt.js": "nuxt", "nuxtjs": "nuxt",
+    "node.js": "nodejs", "node": "nodejs",
+    "expressjs": "express", "express.js": "express",
+    "js": "javascript", "ts": "typescript",
+    "golang": "go",
+    "objective c": "objective-c",
+    "html5": "html", "css3": "css", "css 3": "css",
+    "dotnet": ".net", "rails": "ruby on rails", "ror": "ruby on rails",
+    "postgres": "postgresql",
+    "mssql": "sql server", "ms sql": "sql server", "microsoft sql server": "sql server",
+    "mongo": "mongodb", "elastic search": "elasticsearch",
+    "k8s": "kubernetes",
+    "amazon web services": "aws", "google cloud": "gcp", "google cloud platform": "gcp",
+    "aws cloudformation": "cloudformation",
+    "apache spark": "spark", "apache airflow": "airflow", "apache kafka": "kafka",
+    "sklearn": "scikit-learn",
+    "ml": "machine learning",
+    "pentest": "penetration testing",
+    "robotic process automation (rpa)": "rpa",
+    "tailwind css": "tailwind", "tailwindcss": "tailwind",
+}
+
 # ML Model settings
 ML_CONFIG = {
     "salary_prediction": {
@@ -59,7 +101,13 @@ ML_CONFIG = {
     "job_clustering": {
         "n_clusters": 8,
         "algorithms": ["kmeans", "dbscan", "hierarchical"],
-    }
+    },
+    "job_recommender": {
+        # "exact" (brute force) or "lsh" (approximate, for large job histories)
+        "index": os.getenv("RECOMMENDER_INDEX", "exact"),
+        # Sized for ~100k-200k jobs; use ~14 bits and 16 tables around 1M
+        "lsh": {"n_tables": 12, "n_bits": 10, "n_probes": 2},
+    },
 }
 
 # Visualization settings
@@ -70,6 +118,9 @@ VIZ_CONFIG = {
     "dpi": 300,
 }
 
+# Currency conversion used when parsing salaries
+USD_TO_VND = 24_000
+
 # Salary ranges (VND per month)
 SALARY_RANGES = {
     "junior": (5_000_000, 15_000_000),
@@ -10,6 +10,8 @@ from src.data_processing.processor import DataProcessor
 from src.analysis.salary_analytics import SalaryAnalyzer
 from src.nlp.skill_analyzer import SkillAnalyzer
 from src.ml_models.salary_prediction import SalaryPredictor
+from src.ml_models.job_recommender import JobRecommender
+from src.data_processing.skills import add_skills_column
 from config.config import CLEAN_CSV_PATH, OUTPUTS_DIR
 
 
@@ -23,7 +25,8 @@ def run_data_processing():
     processor.process_pipeline()
     processor.get_summary()
     
-    return processor.df
+    # Parse skills once for all analysis steps
+    return add_skills_column(processor.df)
 
 
 def run_salary_analysis(df):
@@ -106,6 +109,9 @@ def run_ml_models(df):
         save_path=OUTPUTS_DIR / "feature_importance.png"
     )
     
+    # Recommender artifacts, memory-mapped by the dashboard at startup
+    JobRecommender().load_data().build_features().save_artifacts()
+    
     print("\n✓ ML models completed!")
 
 
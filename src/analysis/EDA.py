@@ -1,6 +1,5 @@
 import ast
 import numpy as np
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from collections import Counter
@@ -11,10 +10,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from config.config import CLEAN_CSV_PATH
+from src.data_processing.storage import load_processed
 
 # đọc dữ liệu
-df = pd.read_csv(CLEAN_CSV_PATH)
+df = load_processed()
 
 
 # ==================================================
@@ -43,7 +42,7 @@ def most_job_groups(df):
 def job_group_grouped_by_level(df):
     df_filtered = df[df['level'] != "Unknown"]
 
-    grouped = df_filtered.groupby(['job_group', 'level']).size().unstack(fill_value=0)
+    grouped = df_filtered.groupby(['job_group', 'level'], observed=True).size().unstack(fill_value=0)
 
     ax = grouped.plot(kind='bar', figsize=(20, 10))
     plt.xlabel("Job group")
@@ -62,6 +61,8 @@ def job_group_grouped_by_level(df):
 # 3. PHÂN TÍCH PROGRAMMING LANGUAGE / FRAMEWORK / TOOLS
 # ==================================================
 def extract_list_safe(x):
+    if isinstance(x, list):
+        return x
     try:
         return ast.literal_eval(x)
     except:
@@ -135,7 +136,7 @@ def average_salary_by_level(df, job_group_name):
 
     salary_by_level = (
         df_job.dropna(subset=['salary_clean'])
-        .groupby('level')['salary_clean']
+        .groupby('level', observed=True)['salary_clean']
         .mean()
         .sort_values(ascending=False)
     )
@@ -0,0 +1,181 @@
+"""
+Precomputed aggregate cube for the dashboard
+Posting counts, salary moments and salary sketches per
+(job_group, level, city, month) cell. Filters select cells and charts roll
+cells up, so no page has to rescan the postings.
+"""
+import sys
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.analysis.quantile_sketch import LogBuckets
+
+
+DIMENSIONS = ['job_group', 'level', 'city', 'month']
+
+# Additive measures stored per cell
+MEASURES = ['count', 'salary_count', 'salary_sum', 'salary_sumsq']
+
+DATE_FORMAT = '%d/%m/%Y %H:%M'
+
+
+def posting_month(df: pd.DataFrame) -> pd.Series:
+    """'YYYY-MM' of each posting date (NaN when missing or unparseable)"""
+    if 'post_dates_formatted' not in df.columns:
+        return pd.Series(np.nan, index=df.index, dtype=object)
+    raw = df['post_dates_formatted']
+    dates = pd.to_datetime(raw, format=DATE_FORMAT, errors='coerce')
+    # Crawler runs store ISO timestamps instead
+    other = dates.isna() & raw.notna()
+    if other.any():
+        dates[other] = pd.to_datetime(raw[other], format='ISO8601', errors='coerce')
+    return dates.dt.strftime('%Y-%m').astype(object).where(dates.notna())
+
+
+class AggregateCube:
+    """Aggregates of the postings per (job_group, level, city, month) cell
+
+    ``cells`` holds the dimension values and the additive measures (plus
+    salary min/max) of every non-empty cell, ``histograms`` one salary
+    sketch per cell and ``companies`` a cell × company posting count matrix
+    for distinct-company counts. ``where`` narrows the cube to the cells
+    matching a filter; ``rollup`` and ``summary`` aggregate the remaining
+    cells.
+    """
+
+    def __init__(self, cells: pd.DataFrame, histograms: np.ndarray,
+                 companies: sparse.csr_matrix, company_names: List[str],
+                 row_cells: pd.Series, buckets: LogBuckets):
+        self.cells = cells
+        self.histograms = histograms
+        self.companies = companies
+        self.company_names = np.asarray(company_names, dtype=object)
+        self.row_cells = row_cells
+        self.buckets = buckets
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, salary_column: str = 'salary_numeric',
+                   buckets: LogBuckets = None, dimensions: List[str] = None) -> 'AggregateCube':
+        """Build the cube from the processed postings (over a subset of DIMENSIONS if given)"""
+        buckets = buckets or LogBuckets()
+        dimensions = dimensions or DIMENSIONS
+        keys = pd.DataFrame({
+            dim: df[dim].astype(object) if dim in df.columns else np.nan
+            for dim in dimensions if dim != 'month'
+        }, index=df.index)
+        if 'month' in dimensions:
+            keys['month'] = posting_month(df)
+
+        cell = keys.groupby(dimensions, dropna=False, sort=True).ngroup().to_numpy()
+        n_cells = int(cell.max()) + 1 if len(cell) else 0
+
+        salary = (pd.to_numeric(df[salary_column], errors='coerce').to_numpy(dtype=np.float64)
+                  if salary_column in df.columns else np.full(len(df), np.nan))
+        has_salary = ~np.isnan(salary)
+
+        grouped = keys.assign(cell=cell, salary=salary, salary_sq=salary ** 2).groupby('cell')
+        cells = grouped[dimensions].first()
+        cells['count'] = grouped.size()
+        cells['salary_count'] = grouped['salary'].count()
+        cells['salary_sum'] = grouped['salary'].sum()
+        cells['salary_sumsq'] = grouped['salary_sq'].sum()
+        cells['salary_min'] = grouped['salary'].min()
+        cells['salary_max'] = grouped['salary'].max()
+
+        histograms = buckets.histogram(salary[has_salary], cell[has_salary], n_cells)
+
+        if 'company_names' in df.columns:
+            codes, company_names = pd.factorize(df['company_names'])
+        else:
+            codes, company_names = np.full(len(df), -1), []
+        known = codes >= 0
+        companies = sparse.csr_matrix(
+            (np.ones(known.sum(), dtype=np.int32), (cell[known], codes[known])),
+            shape=(n_cells, len(company_names)),
+        )
+
+        return cls(cells, histograms, companies, list(company_names),
+                   pd.Series(cell, index=df.index), buckets)
+
+    def where(self, **filters) -> 'AggregateCube':
+        """Cells matching ``dimension=value`` filters ('All' and None are ignored)"""
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, value in filters.items():
+            if value is not None and value != 'All':
+                mask &= (self.cells[dim] == value).to_numpy()
+        return AggregateCube(self.cells[mask], self.histograms[mask], self.companies[mask],
+                             self.company_names, self.row_cells, self.buckets)
+
+    def members(self, dim: str) -> list:
+        """Sorted values of a dimension present in the cube"""
+        return sorted(self.cells[dim].dropna().unique().tolist())
+
+    def rows(self) -> pd.Index:
+        """Index labels of the postings in this cube"""
+        return self.row_cells.index[np.isin(self.row_cells.to_numpy(), self.cells.index)]
+
+    def rollup(self, by: str = None) -> pd.DataFrame:
+        """Aggregate cells per value of ``by`` (a single 'All' row if None)
+
+        Returns count (postings), salary_count, mean, std, min, max, p25,
+        median, p75 (salaries in VND) and companies (distinct). Quantiles
+        come from the sketches and are accurate to ``buckets.accuracy``.
+        """
+        keys = self.cells[by] if by else pd.Series('All', index=self.cells.index)
+        codes, members = pd.factorize(keys, sort=True)
+        keep = codes >= 0
+        groups = sparse.csr_matrix(
+            (np.ones(keep.sum()), (codes[keep], np.flatnonzero(keep))),
+            shape=(len(members), len(self.cells)),
+        )
+
+        sums = {m: groups @ self.cells[m].to_numpy(dtype=np.float64) for m in MEASURES}
+        n = sums['salary_count']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = sums['salary_sum'] / n
+            var = (sums['salary_sumsq'] - sums['salary_sum'] * mean) / (n - 1)
+        std = np.where(n > 1, np.sqrt(np.maximum(var, 0)), np.nan)
+
+        lo = np.full(len(members), np.nan)
+        hi = np.full(len(members), np.nan)
+        np.fmin.at(lo, codes[keep], self.cells['salary_min'].to_numpy(dtype=np.float64)[keep])
+        np.fmax.at(hi, codes[keep], self.cells['salary_max'].to_numpy(dtype=np.float64)[keep])
+
+        quartiles = self.buckets.quantiles(groups @ self.histograms, [0.25, 0.5, 0.75])
+        companies = np.asarray(((groups @ self.companies) > 0).sum(axis=1)).ravel()
+
+        return pd.DataFrame({
+            'count': sums['count'].astype(int),
+            'salary_count': n.astype(int),
+            'mean': mean, 'std': std, 'min': lo, 'max': hi,
+            'p25': quartiles[:, 0], 'median': quartiles[:, 1], 'p75': quartiles[:, 2],
+            'companies': companies,
+        }, index=pd.Index(members, name=by))
+
+    def summary(self) -> pd.Series:
+        """Totals over all cells of the cube (see ``rollup``)"""
+        if len(self.cells) == 0:
+            empty = self.rollup().reindex(['All']).iloc[0]
+            return empty.fillna({'count': 0, 'salary_count': 0, 'companies': 0})
+        return self.rollup().iloc[0]
+
+    def top_companies(self, n: int = 10) -> pd.Series:
+        """Companies with the most postings"""
+        counts = np.asarray(self.companies.sum(axis=0)).ravel()
+        top = np.argsort(-counts, kind='stable')[:n]
+        top = top[counts[top] > 0]
+        return pd.Series(counts[top], index=self.company_names[top], name='count')
+
+    def salary_histogram(self, bins: int = 30) -> pd.Series:
+        """Salary distribution as ``bins`` equal-width bins (index: bin centers)"""
+        counts = self.histograms.sum(axis=0)
+        nonzero = np.flatnonzero(counts)
+        if len(nonzero) == 0:
+            return pd.Series(dtype=np.int64)
+        hist, edges = np.histogram(self.buckets.value(nonzero), bins=bins,
+                                   weights=counts[nonzero])
+        return pd.Series(hist.astype(np.int64), index=(edges[:-1] + edges[1:]) / 2)
@@ -0,0 +1,59 @@
+"""
+Mergeable quantile sketch for salaries
+Values are counted in logarithmic buckets (DDSketch-style), so any
+quantile is returned within a fixed relative error and two sketches are
+merged by adding their bucket counts.
+"""
+import numpy as np
+
+
+class LogBuckets:
+    """Logarithmic bucketing of positive values
+
+    Bucket ``i`` covers ``(gamma**(i-1), gamma**i] * min_value``, with
+    ``gamma = (1 + accuracy) / (1 - accuracy)``. Reporting a bucket by its
+    midpoint keeps the relative error of every quantile below ``accuracy``.
+    Values outside ``[min_value, max_value]`` fall into the end buckets.
+    """
+
+    def __init__(self, accuracy: float = 0.01, min_value: float = 1e5, max_value: float = 1e10):
+        self.accuracy = accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.n_buckets = int(np.ceil(np.log(max_value / min_value) / self.log_gamma)) + 1
+
+    def index(self, values: np.ndarray) -> np.ndarray:
+        """Bucket index of each value"""
+        values = np.maximum(np.asarray(values, dtype=np.float64), self.min_value)
+        idx = np.ceil(np.log(values / self.min_value) / self.log_gamma)
+        return np.clip(idx, 0, self.n_buckets - 1).astype(np.int64)
+
+    def value(self, idx: np.ndarray) -> np.ndarray:
+        """Representative value of each bucket"""
+        upper = self.min_value * self.gamma ** np.asarray(idx, dtype=np.float64)
+        return upper * 2 / (self.gamma + 1)
+
+    def histogram(self, values: np.ndarray, groups: np.ndarray = None,
+                  n_groups: int = 1) -> np.ndarray:
+        """Bucket counts, one row per group (``groups`` holds each value's group code)"""
+        idx = self.index(values)
+        groups = np.zeros(len(idx), dtype=np.int64) if groups is None else groups
+        flat = np.bincount(groups * self.n_buckets + idx, minlength=n_groups * self.n_buckets)
+        return flat.reshape(n_groups, self.n_buckets).astype(np.int64)
+
+    def quantiles(self, hist: np.ndarray, qs) -> np.ndarray:
+        """Quantiles ``qs`` of each histogram row (NaN for empty rows)
+
+        Returns an array of shape ``(rows, len(qs))``.
+        """
+        hist = np.atleast_2d(hist)
+        qs = np.atleast_1d(np.asarray(qs, dtype=np.float64))
+        cum = np.cumsum(hist, axis=1)
+        total = cum[:, -1:]
+        rank = np.floor(qs[None, :] * np.maximum(total - 1, 0)) + 1
+        # First bucket whose cumulative count reaches the rank
+        idx = (cum[:, None, :] < rank[:, :, None]).sum(axis=2)
+        result = self.value(np.minimum(idx, self.n_buckets - 1))
+        return np.where(total > 0, result, np.nan)
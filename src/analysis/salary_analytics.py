@@ -8,28 +8,43 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from itertools import chain
+from scipy.stats import t as student_t
 from typing import Dict, List, Tuple
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from config.config import SALARY_RANGES, OUTPUTS_DIR
+from src.data_processing.storage import load_processed
+from src.data_processing.skills import add_skills_column, get_skills
+from src.analysis.salary_sketches import SalarySketches
 
 
 class SalaryAnalyzer:
-    """Analyze salary data and trends"""
+    """Analyze salary data and trends
     
-    def __init__(self, df: pd.DataFrame = None):
+    If ``sketches`` (SalarySketches of the same data) are given, the overall,
+    job group, level and city statistics are read from them instead of
+    grouping and sorting the salaries; quantiles are then accurate to the
+    sketches' relative error (1% by default).
+    """
+    
+    def __init__(self, df: pd.DataFrame = None, sketches: SalarySketches = None):
         self.df = df
+        self.sketches = sketches
         self.stats = {}
         
-    def load_data(self, file_path):
+    def load_data(self, file_path=None):
         """Load data from file"""
-        self.df = pd.read_csv(file_path)
+        self.df = add_skills_column(load_processed(file_path))
         return self
     
     def calculate_statistics(self) -> Dict:
         """Calculate salary statistics"""
         print("📊 Calculating salary statistics...")
         
+        if self.sketches is not None:
+            return self._sketch_statistics()
+        
         # Filter valid salary data
         valid_salaries = self.df[self.df['salary_numeric'].notna()]['salary_numeric']
         
@@ -51,22 +66,53 @@ class SalaryAnalyzer:
         print(f"✓ Analyzed {self.stats['count']} salary records")
         return self.stats
     
+    def _sketch_statistics(self) -> Dict:
+        """calculate_statistics from the sketches"""
+        summary = self.sketches.summary()
+        if summary['salary_count'] == 0:
+            print("⚠️  No valid salary data found")
+            return {}
+        
+        self.stats = {
+            'count': int(summary['salary_count']),
+            'mean': summary['mean'],
+            'median': summary['median'],
+            'std': summary['std'],
+            'min': summary['min'],
+            'max': summary['max'],
+            'q25': summary['p25'],
+            'q75': summary['p75'],
+        }
+        
+        print(f"✓ Analyzed {self.stats['count']} salary records (sketches)")
+        return self.stats
+    
+    def _sketch_rollup(self, by: str, columns: List[str]) -> pd.DataFrame:
+        """Per-group salary statistics from the sketches, like the groupby aggregations"""
+        rollup = self.sketches.rollup(by)
+        rollup = rollup[rollup['salary_count'] > 0].drop(columns='count')
+        return rollup.rename(columns={'salary_count': 'count'})[columns].round(0)
+    
     def salary_by_job_group(self) -> pd.DataFrame:
         """Analyze salary distribution by job group"""
         print("💼 Analyzing salary by job group...")
         
-        # Filter valid data
-        df_valid = self.df[self.df['salary_numeric'].notna()].copy()
-        
-        # Group by job group
-        salary_by_group = df_valid.groupby('job_group')['salary_numeric'].agg([
-            ('count', 'count'),
-            ('mean', 'mean'),
-            ('median', 'median'),
-            ('min', 'min'),
-            ('max', 'max'),
-            ('std', 'std')
-        ]).round(0)
+        if self.sketches is not None:
+            salary_by_group = self._sketch_rollup(
+                'job_group', ['count', 'mean', 'median', 'min', 'max', 'std'])
+        else:
+            # Filter valid data
+            df_valid = self.df[self.df['salary_numeric'].notna()].copy()
+            
+            # Group by job group
+            salary_by_group = df_valid.groupby('job_group', observed=True)['salary_numeric'].agg([
+                ('count', 'count'),
+                ('mean', 'mean'),
+                ('median', 'median'),
+                ('min', 'min'),
+                ('max', 'max'),
+                ('std', 'std')
+            ]).round(0)
         
         salary_by_group = salary_by_group.sort_values('median', ascending=False)
         
@@ -76,17 +122,20 @@ class SalaryAnalyzer:
         """Analyze salary distribution by experience level"""
         print("📈 Analyzing salary by experience level...")
         
-        # Filter valid data
-        df_valid = self.df[self.df['salary_numeric'].notna()].copy()
-        
-        # Group by level
-        salary_by_level = df_valid.groupby('level')['salary_numeric'].agg([
-            ('count', 'count'),
-            ('mean', 'mean'),
-            ('median', 'median'),
-            ('min', 'min'),
-            ('max', 'max'),
-        ]).round(0)
+        if self.sketches is not None:
+            salary_by_level = self._sketch_rollup('level', ['count', 'mean', 'median', 'min', 'max'])
+        else:
+            # Filter valid data
+            df_valid = self.df[self.df['salary_numeric'].notna()].copy()
+            
+            # Group by level
+            salary_by_level = df_valid.groupby('level', observed=True)['salary_numeric'].agg([
+                ('count', 'count'),
+                ('mean', 'mean'),
+                ('median', 'median'),
+                ('min', 'min'),
+                ('max', 'max'),
+            ]).round(0)
         
         # Sort by predefined level order
         level_order = ['fresher', 'junior', 'mid', 'senior', 'lead', 'manager']
@@ -100,65 +149,70 @@ class SalaryAnalyzer:
         """Analyze salary distribution by city"""
         print("🌍 Analyzing salary by city...")
         
-        # Filter valid data
-        df_valid = self.df[self.df['salary_numeric'].notna()].copy()
-        
-        # Group by city
-        salary_by_city = df_valid.groupby('city')['salary_numeric'].agg([
-            ('count', 'count'),
-            ('mean', 'mean'),
-            ('median', 'median'),
-        ]).round(0)
+        if self.sketches is not None:
+            salary_by_city = self._sketch_rollup('city', ['count', 'mean', 'median'])
+        else:
+            # Filter valid data
+            df_valid = self.df[self.df['salary_numeric'].notna()].copy()
+            
+            # Group by city
+            salary_by_city = df_valid.groupby('city', observed=True)['salary_numeric'].agg([
+                ('count', 'count'),
+                ('mean', 'mean'),
+                ('median', 'median'),
+            ]).round(0)
         
         salary_by_city = salary_by_city.sort_values('median', ascending=False)
         
         return salary_by_city
     
-    def salary_by_skill(self, top_n: int = 20) -> pd.DataFrame:
-        """Analyze average salary by skill"""
+    def salary_by_skill(self, top_n: int = 20, min_count: int = 3,
+                        confidence: float = 0.95) -> pd.DataFrame:
+        """Salary statistics per skill, highest average first
+        
+        The salaried postings are exploded into one (skill, salary) pair per
+        listed skill and all skills are aggregated in one grouped pass.
+        Returns count, avg/median/p25/p75/std salary and a ``confidence``
+        interval for the average (Student's t) for every skill listed by
+        at least ``min_count`` postings.
+        """
         print(f"🔧 Analyzing salary by skill (top {top_n})...")
         
-        import ast
-        
-        # Filter valid data
-        df_valid = self.df[self.df['salary_numeric'].notna()].copy()
+        # Filter valid data (only the two columns needed)
+        valid = self.df['salary_numeric'].notna().to_numpy()
+        skills = get_skills(self.df)[valid]
         
-        # Collect skill-salary pairs
-        skill_salaries = {}
-        
-        for idx, row in df_valid.iterrows():
-            skills = row.get('array_skills', [])
-            if isinstance(skills, str):
-                try:
-                    skills = ast.literal_eval(skills)
-                except:
-                    skills = []
-            
-            salary = row['salary_numeric']
-            
-            if isinstance(skills, list):
-                for skill in skills:
-                    skill_lower = str(skill).lower().strip()
-                    if skill_lower not in skill_salaries:
-                        skill_salaries[skill_lower] = []
-                    skill_salaries[skill_lower].append(salary)
+        # One row per (posting, skill) pair
+        codes, names = pd.factorize(pd.Series(list(chain.from_iterable(skills)), dtype=object))
+        salaries = np.repeat(self.df['salary_numeric'].to_numpy(dtype=np.float64)[valid],
+                             skills.map(len).to_numpy(dtype=np.int64))
+        grouped = pd.Series(salaries).groupby(codes)
         
         # Calculate statistics
-        skill_stats = []
-        for skill, salaries in skill_salaries.items():
-            if len(salaries) >= 3:  # At least 3 occurrences
-                skill_stats.append({
-                    'skill': skill,
-                    'count': len(salaries),
-                    'avg_salary': np.mean(salaries),
-                    'median_salary': np.median(salaries),
-                })
-        
-        # Create DataFrame
-        df_skill_salary = pd.DataFrame(skill_stats)
-        df_skill_salary = df_skill_salary.sort_values('avg_salary', ascending=False)
-        
-        return df_skill_salary.head(top_n)
+        skill_stats = grouped.agg(['count', 'mean', 'median', 'std'])
+        quartiles = grouped.quantile([0.25, 0.75]).unstack()
+        skill_stats = skill_stats[skill_stats['count'] >= min_count]
+        quartiles = quartiles.reindex(index=skill_stats.index, columns=[0.25, 0.75])
+        
+        count = skill_stats['count'].to_numpy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            margin = (student_t.ppf((1 + confidence) / 2, count - 1)
+                      * skill_stats['std'].to_numpy() / np.sqrt(count))
+        
+        df_skill_salary = pd.DataFrame({
+            'skill': np.asarray(names, dtype=object)[skill_stats.index],
+            'count': count,
+            'avg_salary': skill_stats['mean'].to_numpy(),
+            'median_salary': skill_stats['median'].to_numpy(),
+            'p25_salary': quartiles[0.25].to_numpy(),
+            'p75_salary': quartiles[0.75].to_numpy(),
+            'std_salary': skill_stats['std'].to_numpy(),
+            'ci_low': skill_stats['mean'].to_numpy() - margin,
+            'ci_high': skill_stats['mean'].to_numpy() + margin,
+        })
+        df_skill_salary = df_skill_salary.sort_values('avg_salary', ascending=False, kind='stable')
+        
+        return df_skill_salary.head(top_n).reset_index(drop=True)
     
     def plot_salary_distribution(self, save_path=None):
         """Plot salary distribution"""
@@ -321,13 +375,12 @@ class SalaryAnalyzer:
 
 
 if __name__ == "__main__":
-    from config.config import CLEAN_CSV_PATH
-    
     # Load data
-    df = pd.read_csv(CLEAN_CSV_PATH)
+    df = add_skills_column(load_processed())
     
-    # Create analyzer
-    analyzer = SalaryAnalyzer(df)
+    # Create analyzer (with the persisted sketches if they match the data)
+    sketches = SalarySketches().load()
+    analyzer = SalaryAnalyzer(df, sketches if sketches.is_current() else None)
     
     # Generate report
     report = analyzer.generate_report()
@@ -0,0 +1,147 @@
+"""
+Persistent salary sketches per (job_group, level, city)
+Updated by the data processor as batches are saved, so percentile queries
+never rescan or sort the postings, and sketches of separate crawl batches
+merge by adding them.
+"""
+import sys
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.config import SALARY_SKETCHES_PATH
+from src.analysis.aggregate_cube import AggregateCube, MEASURES
+from src.analysis.quantile_sketch import LogBuckets
+from src.data_processing.storage import data_fingerprint
+
+
+KEYS = ['job_group', 'level', 'city']
+
+# Per-cell columns persisted next to the histograms
+CELL_MEASURES = MEASURES + ['salary_min', 'salary_max']
+
+
+class SalarySketches:
+    """Salary moments and LogBuckets histograms per (job_group, level, city)
+
+    Every cell is additive (counts, sums and bucket counts; min/max combine
+    by min/max), so ``add`` and ``merge`` give exactly the sketches of the
+    union of the batches. ``where``, ``rollup`` and ``summary`` answer like
+    the dashboard's AggregateCube, with quantiles within ``buckets.accuracy``.
+    ``version`` is the data fingerprint the sketches were saved for.
+    """
+
+    def __init__(self, path: Path = None, buckets: LogBuckets = None):
+        self.path = Path(path or SALARY_SKETCHES_PATH)
+        self.buckets = buckets or LogBuckets()
+        self.cells = pd.DataFrame({**{key: pd.Series(dtype=object) for key in KEYS},
+                                   **{m: pd.Series(dtype=np.float64) for m in CELL_MEASURES}})
+        self.histograms = np.zeros((0, self.buckets.n_buckets), dtype=np.int64)
+        self.version = ''
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, path: Path = None,
+                   buckets: LogBuckets = None) -> 'SalarySketches':
+        """Sketches of the postings in ``df``"""
+        return cls(path, buckets).add(df)
+
+    def add(self, df: pd.DataFrame, salary_column: str = 'salary_numeric'):
+        """Add the postings of ``df`` to their cells"""
+        batch = AggregateCube.from_frame(df, salary_column, self.buckets, dimensions=KEYS)
+        return self._combine(batch.cells[KEYS + CELL_MEASURES], batch.histograms)
+
+    def merge(self, other: 'SalarySketches'):
+        """Add the cells of sketches built from another batch"""
+        if other.buckets.n_buckets != self.buckets.n_buckets or \
+                other.buckets.accuracy != self.buckets.accuracy:
+            raise ValueError("Cannot merge sketches with different bucket layouts")
+        return self._combine(other.cells, other.histograms)
+
+    def _combine(self, cells: pd.DataFrame, histograms: np.ndarray):
+        """Append cells and sum the ones sharing a key"""
+        cells = pd.concat([self.cells, cells[KEYS + CELL_MEASURES]], ignore_index=True)
+        cell = cells.groupby(KEYS, dropna=False, sort=True).ngroup().to_numpy()
+        grouped = cells.groupby(cell)
+
+        combined = grouped[KEYS].first()
+        for m in MEASURES:
+            combined[m] = grouped[m].sum()
+        combined['salary_min'] = grouped['salary_min'].min()
+        combined['salary_max'] = grouped['salary_max'].max()
+
+        summed = np.zeros((len(combined), self.buckets.n_buckets), dtype=np.int64)
+        np.add.at(summed, cell, np.vstack([self.histograms, histograms]))
+
+        self.cells = combined.reset_index(drop=True)
+        self.histograms = summed
+        return self
+
+    def cube(self) -> AggregateCube:
+        """The sketches as an AggregateCube (without company counts or rows)"""
+        return AggregateCube(self.cells, self.histograms,
+                             sparse.csr_matrix((len(self.cells), 0), dtype=np.int32), [],
+                             pd.Series(dtype=np.int64), self.buckets)
+
+    def where(self, **filters) -> AggregateCube:
+        """Cells matching ``dimension=value`` filters ('All' and None are ignored)"""
+        return self.cube().where(**filters)
+
+    def rollup(self, by: str = None) -> pd.DataFrame:
+        """Aggregate cells per value of ``by`` (see AggregateCube.rollup)"""
+        return self.cube().rollup(by)
+
+    def summary(self) -> pd.Series:
+        """Totals over all cells (see AggregateCube.rollup)"""
+        return self.cube().summary()
+
+    def is_current(self, data_path: Path = None) -> bool:
+        """Whether the sketches were saved for the current processed dataset"""
+        return bool(self.version) and self.version == data_fingerprint(data_path)
+
+    def load(self):
+        """Load the sketches from disk (empty if the file does not exist)"""
+        if self.path.exists():
+            with np.load(self.path) as saved:
+                accuracy, min_value, max_value = saved['buckets'].tolist()
+                self.buckets = LogBuckets(accuracy, min_value, max_value)
+                keys = pd.DataFrame(saved['keys'], columns=KEYS).astype(object)
+                self.cells = pd.concat([keys.where(keys != '', np.nan),
+                                        pd.DataFrame(saved['measures'], columns=CELL_MEASURES)],
+                                       axis=1)
+                self.histograms = saved['histograms']
+                self.version = str(saved['version'][0])
+        return self
+
+    def save(self, version: str = None):
+        """Write the sketches to disk, tagged with ``version`` (a data fingerprint)"""
+        if version is not None:
+            self.version = version
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(f,
+                     keys=self.cells[KEYS].fillna('').astype(str).to_numpy(dtype=str).reshape(-1, len(KEYS)),
+                     measures=self.cells[CELL_MEASURES].to_numpy(dtype=np.float64),
+                     histograms=self.histograms,
+                     buckets=np.array([self.buckets.accuracy, self.buckets.min_value,
+                                       self.buckets.max_value]),
+                     version=np.array([self.version]))
+        tmp.replace(self.path)
+        return self
+
+    def __len__(self):
+        return len(self.cells)
+
+
+if __name__ == "__main__":
+    from src.data_processing.storage import load_processed
+
+    sketches = SalarySketches().load()
+    if not sketches.is_current():
+        print("🔧 Sketches missing or stale, rebuilding from the processed data...")
+        sketches = SalarySketches.from_frame(
+            load_processed(columns=KEYS + ['salary_numeric'])).save(data_fingerprint())
+    print(f"✓ {len(sketches)} cells, {int(sketches.cells['salary_count'].sum())} salaries")
+    print(sketches.rollup('level')[['salary_count', 'mean', 'p25', 'median', 'p75']])
@@ -26,6 +26,11 @@ import pandas as pd
 import re
 from dotenv import load_dotenv
 
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.config import RAW_DEDUP_INDEX_PATH
+from src.data_processing.storage import append_processed, processed_path, data_fingerprint
+from src.data_processing.dedup import DedupIndex
+
 # Fix Windows encoding
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -263,25 +268,28 @@ def save_and_merge(jobs_data):
         df_processed['domain_arr'] = '[]'
         df_processed['post_dates_formatted'] = df['crawled_at']
 
+        # Only postings not yet in the raw file are appended (see DedupIndex)
+        raw_index = DedupIndex(RAW_DEDUP_INDEX_PATH).sync(raw_main, backend='csv')
+        before_raw = len(raw_index)
+        df_new = raw_index.filter_new(df_processed)
         if raw_main.exists():
-            df_raw = pd.read_csv(raw_main)
-            before_raw = len(df_raw)
-            df_raw_merged = pd.concat([df_raw, df_processed], ignore_index=True)
-            df_raw_merged = df_raw_merged.drop_duplicates(subset=['job_names', 'company_names'])
-            df_raw_merged.to_csv(raw_main, index=False, encoding='utf-8-sig')
+            header = pd.read_csv(raw_main, nrows=0, encoding='utf-8-sig').columns
+            df_new.reindex(columns=header).to_csv(raw_main, mode='a', header=False, index=False,
+                                                  encoding='utf-8')
             logger.info("\n🔄 Đã cập nhật data/raw/ITViec_data.csv")
             logger.info(f"  ✓ Trước: {before_raw} jobs")
-            logger.info(f"  ✓ Sau: {len(df_raw_merged)} jobs (+{len(df_raw_merged) - before_raw})")
+            logger.info(f"  ✓ Sau: {len(raw_index)} jobs (+{len(df_new)})")
         else:
-            df_processed.to_csv(raw_main, index=False, encoding='utf-8-sig')
+            df_new.to_csv(raw_main, index=False, encoding='utf-8-sig')
             logger.info("\n💾 Tạo mới data/raw/ITViec_data.csv")
-            logger.info(f"  ✓ Tổng: {len(df_processed)} jobs")
+            logger.info(f"  ✓ Tổng: {len(df_new)} jobs")
+        raw_index.save(data_fingerprint(raw_main))
     except Exception as e:
         logger.error(f"❌ Lỗi cập nhật raw data: {e}")
     
     # Merge
     try:
-        main_file = Path(__file__).parent.parent.parent / "data" / "processed" / "clean_data.csv"
+        main_file = processed_path()
         
         if not main_file.exists():
             return df
@@ -313,16 +321,16 @@ def save_and_merge(jobs_data):
         df_processed['level'] = df['level']
         df_processed['job_group'] = df['job_title'].str.split().str[0]
         
-        df_main = pd.read_csv(main_file)
-        before = len(df_main)
-        
-        df_merged = pd.concat([df_main, df_processed], ignore_index=True)
-        df_merged = df_merged.drop_duplicates(subset=['job_names', 'company_names'])
-        
-        df_merged.to_csv(main_file, index=False, encoding='utf-8-sig')
+        # Append only postings not yet in the processed data, without re-reading it
+        postings = DedupIndex().sync(main_file)
+        before = len(postings)
+        df_new = postings.filter_new(df_processed)
+        if len(df_new) > 0:
+            append_processed(df_new, main_file)
+        postings.save(data_fingerprint(main_file))
         
         logger.info(f"  ✓ Trước: {before} jobs")
-        logger.info(f"  ✓ Sau: {len(df_merged)} jobs (+{len(df_merged) - before})")
+        logger.info(f"  ✓ Sau: {len(postings)} jobs (+{len(df_new)})")
         
     except Exception as e:
         logger.error(f"❌ Lỗi merge: {e}")
@@ -0,0 +1,110 @@
+"""
+Shared read-only access to the processed dataset
+One DataService per process holds the loaded DataFrame; sessions get
+shallow views and index arrays instead of their own copies.
+"""
+import sys
+import threading
+import tracemalloc
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.data_processing.storage import load_processed, processed_path, data_fingerprint
+
+
+class DataService:
+    """Process-wide, read-only holder of the processed dataset
+
+    The data is loaded once (Parquet stores are memory-mapped) and reloaded
+    only when the file fingerprint changes. ``frame`` hands out shallow
+    views that share the underlying arrays; with copy-on-write enabled
+    (always on from pandas 3) a caller adding or overwriting columns
+    never affects other callers. ``take`` materializes only the rows a
+    caller actually needs, given as index labels from a filter.
+    """
+
+    def __init__(self, path: Path = None, prepare: Callable[[pd.DataFrame], pd.DataFrame] = None):
+        self.path = Path(path or processed_path())
+        self.prepare = prepare
+        self.version = None
+        self._df: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Reload the dataset if the file changed since the last load"""
+        version = data_fingerprint(self.path)
+        if version != self.version or self._df is None:
+            with self._lock:
+                if version != self.version or self._df is None:
+                    df = load_processed(self.path)
+                    self._df = self.prepare(df) if self.prepare else df
+                    self.version = version
+        return self
+
+    def frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Zero-copy view of the dataset (optionally only some columns)"""
+        if self._df is None:
+            self.refresh()
+        df = self._df if columns is None else self._df[columns]
+        return df.copy(deep=False)
+
+    def take(self, rows, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Rows with the given index labels (a boolean mask also works)"""
+        df = self.frame(columns)
+        if isinstance(rows, (pd.Series, np.ndarray)) and rows.dtype == bool:
+            return df[rows]
+        return df.loc[rows]
+
+    def __len__(self):
+        return 0 if self._df is None else len(self._df)
+
+
+def benchmark_session_memory(service: DataService, n_sessions: int = 50,
+                             filters: dict = None) -> pd.DataFrame:
+    """Memory kept alive by ``n_sessions`` sessions holding the filtered data
+
+    Compares the previous per-session pattern (copy the frame, then mask
+    it) with views from the shared service plus a filtered index array.
+    Measured with tracemalloc, which NumPy reports its buffers to; the peak
+    includes the transient full copies.
+    """
+    filters = filters or {'level': 'senior'}
+    df = service.frame()
+
+    def per_session_copy():
+        filtered = df.copy()
+        for column, value in filters.items():
+            filtered = filtered[filtered[column] == value]
+        return filtered
+
+    def shared_view():
+        view = service.frame()
+        mask = np.ones(len(view), dtype=bool)
+        for column, value in filters.items():
+            mask &= (view[column] == value).to_numpy()
+        return view, view.index[mask]
+
+    results = []
+    for name, session in [('copy_per_session', per_session_copy), ('shared_service', shared_view)]:
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        sessions = [session() for _ in range(n_sessions)]
+        used, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del sessions
+        results.append({'pattern': name, 'sessions': n_sessions,
+                        'retained_mb': (used - base) / 1e6, 'peak_mb': (peak - base) / 1e6,
+                        'per_session_kb': (used - base) / n_sessions / 1e3})
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    from src.data_processing.skills import add_skills_column
+
+    service = DataService(prepare=add_skills_column).refresh()
+    print(f"✓ Loaded {len(service)} records (version {service.version[:8]})")
+    print("\n📦 Per-session memory:")
+    print(benchmark_session_memory(service))
@@ -0,0 +1,66 @@
+"""
+Global deduplication index of job postings
+A posting is identified by its normalized title, company and location;
+the keys of every record in a dataset are kept in a persistent hash index,
+so writers check only their new rows instead of re-reading the dataset.
+"""
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.config import DEDUP_INDEX_PATH
+from src.data_processing.hash_index import VersionedHashIndex
+from src.data_processing.storage import load_processed, data_fingerprint
+
+
+# Columns identifying a posting (same names in the raw and processed data)
+POSTING_COLUMNS = ['job_names', 'company_names', 'locate_names']
+
+
+def posting_keys(df: pd.DataFrame) -> np.ndarray:
+    """64-bit key of each row's posting
+
+    Values are lowercased with runs of whitespace collapsed, so postings
+    differing only in case or spacing share a key. Missing columns and
+    values count as empty.
+    """
+    normalized = pd.DataFrame({
+        col: (df[col].astype('string').str.lower()
+              .str.replace(r'\s+', ' ', regex=True).str.strip().fillna('')
+              if col in df.columns else '')
+        for col in POSTING_COLUMNS
+    }, index=df.index)
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy(dtype=np.uint64)
+
+
+class DedupIndex(VersionedHashIndex):
+    """Posting keys of one dataset, tagged with the fingerprint of that dataset
+
+    An index whose fingerprint does not match the dataset (written by
+    another tool, edited, or deleted) is rebuilt from the dataset's key
+    columns by ``sync``.
+    """
+
+    def __init__(self, path: Path = None):
+        super().__init__(path or DEDUP_INDEX_PATH)
+
+    def rebuild(self, data_path: Path = None, backend: str = None):
+        """Re-read the posting keys of the dataset"""
+        if data_fingerprint(data_path, backend):
+            print(f"🔧 Rebuilding dedup index {self.path.name}...")
+            self.add(posting_keys(load_processed(data_path, columns=POSTING_COLUMNS,
+                                                 backend=backend)))
+        return self
+
+    def filter_new(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rows of ``df`` with a posting not in the index (the first of repeats), added to it
+
+        Costs O(len(df) log n): only the new rows are hashed and looked up.
+        Returns a new frame (fresh index), so callers can assign columns.
+        """
+        keys = posting_keys(df)
+        is_new = ~pd.Series(keys).duplicated().to_numpy() & ~self.contains(keys)
+        self.add(keys[is_new])
+        return df[is_new].reset_index(drop=True)
@@ -0,0 +1,121 @@
+"""
+Persistent set of 64-bit row hashes
+Stored as a sorted NumPy array, membership checks via binary search
+"""
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.data_processing.storage import data_fingerprint
+
+
+def row_hashes(df: pd.DataFrame, columns: Optional[List[str]] = None) -> np.ndarray:
+    """Stable 64-bit content hash of each row
+
+    Values are compared as text so the hash does not depend on the dtypes
+    pandas happened to infer when the file was read.
+    """
+    data = df[columns] if columns is not None else df
+    data = data.astype(object).where(data.notna(), '').astype(str)
+    return pd.util.hash_pandas_object(data, index=False).to_numpy(dtype=np.uint64)
+
+
+class HashIndex:
+    """Sorted uint64 hash set persisted as a .npy file (in memory only without a path)"""
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else None
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def load(self):
+        """Load hashes from disk (empty if the file does not exist)"""
+        if self.path is not None and self.path.exists():
+            self.hashes = np.load(self.path)
+        return self
+
+    def save(self):
+        """Write hashes to disk"""
+        if self.path is None:
+            raise ValueError("HashIndex has no path to save to")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(self.path, self.hashes)
+        return self
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Boolean mask: which of ``hashes`` are already in the index"""
+        if len(self.hashes) == 0:
+            return np.zeros(len(hashes), dtype=bool)
+        pos = np.searchsorted(self.hashes, hashes)
+        pos[pos == len(self.hashes)] = 0
+        return self.hashes[pos] == hashes
+
+    def add(self, hashes: np.ndarray):
+        """Insert hashes, keeping the array sorted and unique"""
+        new = np.unique(np.asarray(hashes, dtype=np.uint64))
+        new = new[~self.contains(new)]
+        if len(new) > 0:
+            self.hashes = np.insert(self.hashes, np.searchsorted(self.hashes, new), new)
+        return self
+
+    def __len__(self):
+        return len(self.hashes)
+
+
+class VersionedHashIndex(HashIndex):
+    """Hash set describing one dataset, tagged with the fingerprint of that dataset
+
+    Saved as a .npz file. ``sync`` discards the hashes when they were
+    saved for another dataset, or for an earlier state of it (written
+    by another tool, replaced, or deleted).
+    """
+
+    def __init__(self, path: Path = None):
+        super().__init__(path)
+        self.version = ''
+
+    def load(self):
+        """Load hashes and fingerprint from disk (empty if the file does not exist)"""
+        if self.path is not None and self.path.exists():
+            saved = np.load(self.path)
+            if isinstance(saved, np.ndarray):
+                # Untagged .npy from an older layout: never current
+                self.hashes, self.version = saved, ''
+                return self
+            with saved:
+                self.hashes = saved['hashes']
+                self.version = str(saved['version'][0])
+        return self
+
+    def save(self, version: str = None):
+        """Write the index to disk, tagged with ``version`` (a data fingerprint)"""
+        if self.path is None:
+            raise ValueError("HashIndex has no path to save to")
+        if version is not None:
+            self.version = version
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(f, hashes=self.hashes, version=np.array([self.version]))
+        tmp.replace(self.path)
+        return self
+
+    def is_current(self, data_path: Path = None, backend: str = None) -> bool:
+        """Whether the index was saved for the current state of the dataset"""
+        return bool(self.version) and self.version == data_fingerprint(data_path, backend)
+
+    def sync(self, data_path: Path = None, backend: str = None):
+        """Load the index for a dataset, emptied if it is out of date"""
+        self.load()
+        fingerprint = data_fingerprint(data_path, backend)
+        if not (self.version and self.version == fingerprint):
+            self.hashes = np.empty(0, dtype=np.uint64)
+            self.rebuild(data_path, backend)
+            self.version = fingerprint
+        return self
+
+    def rebuild(self, data_path: Path = None, backend: str = None):
+        """Refill the emptied index from the dataset (nothing to recover by default)"""
+        return self
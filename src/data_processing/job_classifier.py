@@ -0,0 +1,76 @@
+"""
+Job group classification
+Compiled keyword matching over job titles with per-title memoization
+"""
+import re
+import pandas as pd
+import numpy as np
+from typing import Dict, List
+
+
+# Ordered by priority: the first group with a matching keyword wins
+JOB_KEYWORDS: Dict[str, List[str]] = {
+    'Backend Developer': ['backend', 'back-end', 'server'],
+    'Frontend Developer': ['frontend', 'front-end'],
+    'Fullstack Developer': ['fullstack', 'full-stack', 'full stack'],
+    'Mobile Developer': ['mobile', 'ios', 'android'],
+    'Data / AI': ['data scientist', 'data engineer', 'machine learning', 'ai', 'ml engineer'],
+    'DevOps / Cloud': ['devops', 'cloud', 'sre', 'infrastructure'],
+    'QA / Tester': ['tester', 'qa', 'quality assurance', 'test'],
+    'UX/UI Designer': ['ux', 'ui', 'designer', 'design'],
+    'Manager / Lead': ['manager', 'lead', 'director', 'head', 'cto', 'cio'],
+    'Security': ['security', 'cybersecurity', 'infosec'],
+    'Database': ['dba', 'database administrator'],
+    'Embedded / Firmware': ['embedded', 'firmware', 'iot'],
+    'Game': ['game developer', 'game designer', 'unity'],
+    'ERP / Enterprise': ['erp', 'sap', 'oracle erp'],
+}
+
+DEFAULT_GROUP = 'Other'
+
+# Titles memoized before the cache is cleared (bounds memory on streaming runs)
+CACHE_SIZE = 200_000
+
+
+class JobGroupClassifier:
+    """Classify job titles into job groups
+
+    Each group's keywords are compiled into one alternation and evaluated
+    column-wise over the distinct lowercased titles only. Results are
+    memoized per title, so repeated titles across postings (and across
+    batches) are classified once; lookups only touch the batch's own
+    titles, and the memo is cleared once it holds ``cache_size`` titles.
+    """
+
+    def __init__(self, job_keywords: Dict[str, List[str]] = None, cache_size: int = CACHE_SIZE):
+        self.job_keywords = job_keywords or JOB_KEYWORDS
+        self.groups = list(self.job_keywords.keys())
+        self.patterns = [
+            re.compile('|'.join(re.escape(k) for k in keywords))
+            for keywords in self.job_keywords.values()
+        ]
+        self.cache_size = cache_size
+        self._cache: Dict[str, str] = {}
+
+    def classify(self, job_names: pd.Series) -> pd.Series:
+        """Return the job group for every title in ``job_names``"""
+        titles = job_names.astype('string').str.lower()
+        codes, uniques = pd.factorize(titles)
+        uniques = uniques.tolist()
+
+        labels = [self._cache.get(t) for t in uniques]
+        unseen_pos = [i for i, label in enumerate(labels) if label is None]
+        if unseen_pos:
+            unseen = pd.Series([uniques[i] for i in unseen_pos], dtype='string')
+            masks = [unseen.str.contains(p, regex=True).to_numpy(dtype=bool)
+                     for p in self.patterns]
+            found = np.select(masks, self.groups, default=DEFAULT_GROUP).tolist()
+            for i, label in zip(unseen_pos, found):
+                labels[i] = label
+            if len(self._cache) + len(found) > self.cache_size:
+                self._cache.clear()
+            self._cache.update(zip(unseen.tolist(), found))
+
+        # One label per distinct title, plus the default for missing titles (code -1)
+        labels = np.array(labels + [DEFAULT_GROUP], dtype=object)
+        return pd.Series(labels[codes], index=job_names.index, name=job_names.name, dtype=object)
@@ -0,0 +1,35 @@
+"""
+Process memory readings for the data pipeline
+Resident set size from the OS; None where it cannot be read (e.g. the
+``resource`` module does not exist on Windows).
+"""
+import sys
+from pathlib import Path
+from typing import Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size in MB (the peak where only that is available)"""
+    statm = Path('/proc/self/statm')
+    if statm.exists() and resource is not None:
+        pages = int(statm.read_text().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    return peak_rss_mb()
+
+
+def format_mb(value: Optional[float]) -> str:
+    return f"{value:,.0f} MB" if value is not None else "n/a"
@@ -2,116 +2,169 @@
 Data processing and cleaning module
 """
 import os
+import io
 import sys
-import ast
 import re
+import contextlib
+import tempfile
+import time
+import warnings
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import CSV_PATH, CLEAN_CSV_PATH, SALARY_RANGES
+from config.config import (CSV_PATH, RAW_MANIFEST_PATH, SALARY_RANGES, PROCESSING_CHUNK_SIZE,
+                           PROCESSING_MEMORY_LIMIT_MB)
+from src.data_processing.salary_parser import parse_salaries, SALARY_COLUMNS
+from src.data_processing.job_classifier import JobGroupClassifier
+from src.data_processing.storage import (load_processed, save_processed, append_processed,
+                                         processed_path, parse_list, data_fingerprint)
+from src.data_processing.hash_index import VersionedHashIndex, row_hashes
+from src.data_processing.dedup import DedupIndex, POSTING_COLUMNS, posting_keys
+from src.data_processing.skills import (SkillVocabulary, SKILL_LIST_COLUMNS, encode_skill_columns,
+                                        get_skills, skill_memory_report)
+from src.data_processing.memory import peak_rss_mb, current_rss_mb, format_mb
+from src.analysis.salary_sketches import SalarySketches, KEYS as SKETCH_KEYS
+
+
+# Every raw crawl column is text; reading it as such keeps the dtypes (and
+# so the part file schemas) identical from one chunk to the next
+RAW_DTYPE = str
+
+# Smallest chunk the memory cap may shrink streaming reads to
+MIN_CHUNK_SIZE = 1_000
+
+# Partitions per worker process (several, so uneven partitions balance out)
+PARTITIONS_PER_WORKER = 4
+
+# Raw columns the row-wise steps only read: sent to the workers, not sent back
+TRANSFORM_READS = ['salaries', 'job_names', 'position_names', 'locate_names']
+
+# Processor of the current worker process, set once by _init_worker
+_worker_processor = None
 
 
 class DataProcessor:
-    """Process and clean job market data"""
+    """Process and clean job market data
+    
+    By default every input row is processed and only postings not already
+    in the output are appended to it; ``incremental`` also skips the raw
+    rows recorded in the manifest by earlier runs. ``rebuild`` instead
+    replaces the output with the records of the input. Batch and
+    streaming runs follow the same rules.
     
-    def __init__(self, input_path=None, output_path=None):
+    ``input_path`` may be a list of raw CSV files (e.g. one per source). With
+    ``chunk_size`` set, ``process_pipeline`` streams the input instead of
+    loading it whole (see ``process_stream``). With ``workers`` > 1 (-1 for
+    all cores) the row-wise steps run in worker processes (see
+    ``transform_parallel``).
+    """
+    
+    def __init__(self, input_path=None, output_path=None, incremental=False, manifest_path=None,
+                 vocabulary_path=None, sketches_path=None, dedup_index_path=None, chunk_size=None,
+                 memory_limit_mb=None, workers=1, rebuild=False):
+        if incremental and rebuild:
+            raise ValueError("incremental and rebuild runs are mutually exclusive")
         self.input_path = input_path or CSV_PATH
-        self.output_path = output_path or CLEAN_CSV_PATH
+        # Streaming writes a partitioned (one part per chunk) Parquet store by default
+        self.output_path = Path(output_path or processed_path('parquet' if chunk_size else None))
+        self.incremental = incremental
+        self.rebuild = rebuild
+        self.chunk_size = chunk_size
+        self.memory_limit_mb = memory_limit_mb or PROCESSING_MEMORY_LIMIT_MB
+        self.workers = os.cpu_count() if workers == -1 else workers
+        self.run_stats = {}
+        self.manifest = VersionedHashIndex(manifest_path or RAW_MANIFEST_PATH)
+        self.vocabulary = SkillVocabulary(vocabulary_path)
+        self.skill_lists = {}
+        self.sketches = SalarySketches(sketches_path)
+        self.postings = DedupIndex(dedup_index_path)
         self.df = None
+        self.raw_hashes = None
+        self.job_classifier = JobGroupClassifier()
         
+    def input_files(self):
+        """Raw CSV files to process"""
+        if isinstance(self.input_path, (list, tuple)):
+            return [Path(path) for path in self.input_path]
+        return [Path(self.input_path)]
+    
     def load_data(self):
         """Load raw data from CSV"""
-        print(f"📂 Loading data from {self.input_path}")
-        self.df = pd.read_csv(self.input_path)
+        files = self.input_files()
+        print(f"📂 Loading data from {', '.join(map(str, files))}")
+        self.df = pd.concat([pd.read_csv(path, dtype=RAW_DTYPE) for path in files],
+                            ignore_index=True)
+        self.raw_hashes = row_hashes(self.df)
         print(f"✓ Loaded {len(self.df)} records")
         return self
     
+    def read_chunks(self):
+        """Yield the raw input in chunks of ``chunk_size`` rows
+        
+        ``chunk_size`` is re-read before every chunk, so the memory cap
+        can shrink it while the files are being read.
+        """
+        for path in self.input_files():
+            with pd.read_csv(path, dtype=RAW_DTYPE, chunksize=self.chunk_size) as reader:
+                while True:
+                    try:
+                        chunk = reader.get_chunk(self.chunk_size)
+                    except StopIteration:
+                        break
+                    yield chunk.reset_index(drop=True)
+    
+    def filter_new_rows(self):
+        """Keep only raw rows recorded in the manifest of the output by no previous run"""
+        print("🧾 Checking manifest for new records...")
+        self.manifest.sync(self.output_path)
+        is_new = ~self.manifest.contains(self.raw_hashes)
+        self.df = self.df[is_new].reset_index(drop=True)
+        print(f"✓ {len(self.df)} new records ({(~is_new).sum()} already processed)")
+        return self
+    
     def clean_salary(self):
-        """Clean and parse salary information"""
+        """Clean and parse salary information into ranges (VND/month)"""
         print("💰 Cleaning salary data...")
         
-        def parse_salary(salary_str):
-            """Parse salary string to numeric value (USD/month)"""
-            if pd.isna(salary_str) or salary_str == "Unknown":
-                return None
-            
-            # Extract numbers from string
-            numbers = re.findall(r'\d+', salary_str)
-            if not numbers:
-                return None
-            
-            # Get first number (usually the base or "Up to" value)
-            value = int(numbers[0])
-            
-            # Convert to VND if in USD (assuming 1 USD = 24,000 VND)
-            if "$" in salary_str:
-                value = value * 24_000
-            elif "K" in salary_str or "k" in salary_str:
-                value = value * 1_000_000
-                
-            return value
+        salary = parse_salaries(self.df['salaries'])
+        for col in SALARY_COLUMNS:
+            self.df[col] = salary[col]
         
-        self.df['salary_numeric'] = self.df['salaries'].apply(parse_salary)
-        print(f"✓ Parsed {self.df['salary_numeric'].notna().sum()} salary values")
+        # Keep salary_numeric as the single figure used by the analytics
+        self.df['salary_numeric'] = self.df['salary_mid']
+        print(f"✓ Parsed {self.df['salary_numeric'].notna().sum()} salary values "
+              f"({self.df['is_negotiable'].sum()} negotiable)")
         return self
     
     def categorize_skills(self):
-        """Categorize skills into different types"""
-        print("🔧 Categorizing skills...")
+        """Categorize skills into different types
         
-        def safe_eval(x):
-            """Safely evaluate string representation of list"""
-            try:
-                return ast.literal_eval(x) if isinstance(x, str) else []
-            except:
-                return []
-        
-        # Process skills columns
-        skill_columns = ['array_skills', 'programming_languages', 'frameworks', 
-                        'tools', 'libraries', 'languages']
+        Also encodes every skill column as int32 skill IDs (``skill_lists``,
+        see SkillLists) over the persisted skill vocabulary.
+        """
+        print("🔧 Categorizing skills...")
         
-        for col in skill_columns:
+        self.parse_skill_columns()
+        self.skill_lists = encode_skill_columns(self.df, self.vocabulary.load())
+        print(f"✓ Skills categorized ({len(self.vocabulary)} distinct skills)")
+        return self
+    
+    def parse_skill_columns(self):
+        """Parse the skill columns into lists (columns already parsed are kept)"""
+        for col in SKILL_LIST_COLUMNS:
             if col in self.df.columns:
-                self.df[col] = self.df[col].apply(safe_eval)
-        
-        print("✓ Skills categorized")
+                self.df[col] = self.df[col].map(parse_list)
         return self
     
     def extract_job_groups(self):
         """Extract and normalize job groups from job names"""
         print("👥 Extracting job groups...")
         
-        job_keywords = {
-            'Backend Developer': ['backend', 'back-end', 'server'],
-            'Frontend Developer': ['frontend', 'front-end'],
-            'Fullstack Developer': ['fullstack', 'full-stack', 'full stack'],
-            'Mobile Developer': ['mobile', 'ios', 'android'],
-            'Data / AI': ['data scientist', 'data engineer', 'machine learning', 'ai', 'ml engineer'],
-            'DevOps / Cloud': ['devops', 'cloud', 'sre', 'infrastructure'],
-            'QA / Tester': ['tester', 'qa', 'quality assurance', 'test'],
-            'UX/UI Designer': ['ux', 'ui', 'designer', 'design'],
-            'Manager / Lead': ['manager', 'lead', 'director', 'head', 'cto', 'cio'],
-            'Security': ['security', 'cybersecurity', 'infosec'],
-            'Database': ['dba', 'database administrator'],
-            'Embedded / Firmware': ['embedded', 'firmware', 'iot'],
-            'Game': ['game developer', 'game designer', 'unity'],
-            'ERP / Enterprise': ['erp', 'sap', 'oracle erp'],
-        }
-        
-        def classify_job(job_name):
-            if pd.isna(job_name):
-                return 'Other'
-            
-            job_name_lower = job_name.lower()
-            for group, keywords in job_keywords.items():
-                if any(keyword in job_name_lower for keyword in keywords):
-                    return group
-            return 'Other'
-        
-        self.df['job_group'] = self.df['job_names'].apply(classify_job)
+        self.df['job_group'] = self.job_classifier.classify(self.df['job_names'])
         print(f"✓ Identified {self.df['job_group'].nunique()} job groups")
         return self
     
@@ -119,36 +172,35 @@ class DataProcessor:
         """Extract experience level from job requirements"""
         print("📊 Extracting experience levels...")
         
-        def get_level(row):
-            """Determine experience level from job data"""
-            # Check if level column exists
-            if 'position_names' in row and pd.notna(row['position_names']):
-                pos = str(row['position_names']).lower()
-                if any(x in pos for x in ['fresher', 'intern', 'entry']):
-                    return 'fresher'
-                elif any(x in pos for x in ['junior', 'jr']):
-                    return 'junior'
-                elif any(x in pos for x in ['senior', 'sr']):
-                    return 'senior'
-                elif any(x in pos for x in ['lead', 'principal', 'staff']):
-                    return 'lead'
-                elif any(x in pos for x in ['manager', 'director', 'head']):
-                    return 'manager'
-            
-            # Check from job name
-            job_name = str(row.get('job_names', '')).lower()
-            if any(x in job_name for x in ['senior', 'sr.']):
-                return 'senior'
-            elif any(x in job_name for x in ['junior', 'jr.']):
-                return 'junior'
-            elif any(x in job_name for x in ['lead', 'principal']):
-                return 'lead'
-            elif any(x in job_name for x in ['manager', 'head', 'director']):
-                return 'manager'
-            else:
-                return 'mid'
+        # (level, keywords) in precedence order: position first, then job title
+        position_rules = [
+            ('fresher', ['fresher', 'intern', 'entry']),
+            ('junior', ['junior', 'jr']),
+            ('senior', ['senior', 'sr']),
+            ('lead', ['lead', 'principal', 'staff']),
+            ('manager', ['manager', 'director', 'head']),
+        ]
+        title_rules = [
+            ('senior', ['senior', 'sr.']),
+            ('junior', ['junior', 'jr.']),
+            ('lead', ['lead', 'principal']),
+            ('manager', ['manager', 'head', 'director']),
+        ]
+        
+        def masks(column, rules):
+            if column not in self.df.columns:
+                return [np.zeros(len(self.df), dtype=bool) for _ in rules]
+            text = self.df[column].astype('string').str.lower()
+            return [
+                text.str.contains('|'.join(re.escape(k) for k in keywords), regex=True)
+                    .fillna(False).to_numpy(dtype=bool)
+                for _, keywords in rules
+            ]
         
-        self.df['level'] = self.df.apply(get_level, axis=1)
+        conditions = masks('position_names', position_rules) + masks('job_names', title_rules)
+        choices = [level for level, _ in position_rules + title_rules]
+        
+        self.df['level'] = np.select(conditions, choices, default='mid')
         print(f"✓ Experience levels: {self.df['level'].value_counts().to_dict()}")
         return self
     
@@ -183,58 +235,113 @@ class DataProcessor:
         return self
     
     def remove_duplicates(self):
-        """Remove duplicate job postings"""
+        """Remove duplicate job postings
+        
+        A posting is kept once per normalized (title, company, location),
+        and dropped if the dedup index already holds it (saved with the
+        output, or seen in an earlier chunk of this run).
+        """
         print("🔄 Removing duplicates...")
         before = len(self.df)
-        self.df = self.df.drop_duplicates(subset=['job_names', 'company_names'], keep='first')
+        self.df = self.postings.filter_new(self.df)
         after = len(self.df)
         print(f"✓ Removed {before - after} duplicates")
         return self
     
     def save_cleaned_data(self):
-        """Save cleaned data to CSV with merge and deduplication"""
-        print(f"💾 Saving cleaned data to {self.output_path}")
-        self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Check if output file exists and merge with existing data
-        if self.output_path.exists():
-            print(f"📂 Found existing output, merging data...")
-            existing_df = pd.read_csv(self.output_path, encoding='utf-8-sig')
-            print(f"   Existing: {len(existing_df)} records")
-            print(f"   New: {len(self.df)} records")
-            
-            # Merge
-            merged_df = pd.concat([existing_df, self.df], ignore_index=True)
-            
-            # Deduplicate by all columns to avoid identical jobs
-            original_count = len(merged_df)
-            merged_df = merged_df.drop_duplicates(keep='first')
-            dedupe_count = original_count - len(merged_df)
-            
-            if dedupe_count > 0:
-                print(f"   🔄 Removed {dedupe_count} duplicates")
-            
-            self.df = merged_df
-            print(f"   ✓ Merged to {len(self.df)} total records")
+        """Save cleaned data, replacing the output
         
-        self.df.to_csv(self.output_path, index=False, encoding='utf-8-sig')
+        The manifest, dedup index and salary sketches start over from the
+        records of this run.
+        """
+        print(f"💾 Saving cleaned data to {self.output_path}")
+        self.manifest = VersionedHashIndex(self.manifest.path)
+        self.postings = DedupIndex(self.postings.path).add(posting_keys(self.df))
+        save_processed(self.df, self.output_path)
+        self._record_manifest()
+        self._record_postings()
+        self._record_vocabulary()
+        self.sketches = SalarySketches.from_frame(self.df, self.sketches.path)
+        self._record_sketches()
         print(f"✓ Saved {len(self.df)} records")
         return self
     
+    def append_cleaned_data(self):
+        """Append newly processed records without re-reading the existing output
+        
+        Postings already in the output were dropped by ``remove_duplicates``.
+        """
+        print(f"💾 Appending cleaned data to {self.output_path}")
+        sketches_current = self.sketches.load().is_current(self.output_path)
+        self.manifest.sync(self.output_path)
+        if len(self.df) > 0:
+            append_processed(self.df, self.output_path)
+        self._record_manifest()
+        self._record_postings()
+        self._record_vocabulary()
+        if sketches_current:
+            self.sketches.add(self.df)
+        else:
+            # Missing, or the data was written without them: rebuild once
+            self.sketches = SalarySketches.from_frame(
+                load_processed(self.output_path, columns=SKETCH_KEYS + ['salary_numeric']),
+                self.sketches.path)
+        self._record_sketches()
+        print(f"✓ Appended {len(self.df)} records")
+        return self
+    
+    def _record_manifest(self):
+        """Mark every raw row of this run as processed into the saved data
+        
+        The manifest is tagged with the data's fingerprint, so it is only
+        trusted for the output it was recorded with (see filter_new_rows).
+        """
+        self.manifest.add(self.raw_hashes).save(data_fingerprint(self.output_path))
+    
+    def _record_postings(self):
+        """Persist the dedup index, tagged with the fingerprint of the saved data"""
+        self.postings.save(data_fingerprint(self.output_path))
+    
+    def _record_vocabulary(self):
+        """Persist the skill IDs used by this run (see SkillVocabulary)"""
+        if not self.vocabulary.ids:
+            self.vocabulary.load()
+        self.vocabulary.add(get_skills(self.df)).save()
+        print(f"✓ Skill vocabulary: {len(self.vocabulary)} skills")
+    
+    def _record_sketches(self):
+        """Persist the salary sketches, tagged with the fingerprint of the saved data"""
+        self.sketches.save(data_fingerprint(self.output_path))
+        print(f"✓ Salary sketches: {len(self.sketches)} (job_group, level, city) cells")
+    
     def process_pipeline(self):
         """Run complete data processing pipeline"""
+        if self.chunk_size:
+            return self.process_stream()
+        
         print("\n" + "="*60)
         print("🚀 STARTING DATA PROCESSING PIPELINE")
         print("="*60 + "\n")
         
-        (self.load_data()
-            .remove_duplicates()
-            .clean_salary()
-            .categorize_skills()
-            .extract_job_groups()
-            .extract_experience_level()
-            .clean_location()
-            .save_cleaned_data())
+        self.load_data()
+        
+        if self.incremental:
+            self.filter_new_rows()
+            if len(self.df) == 0:
+                print("\n✅ No new records - nothing to do\n")
+                return self
+        
+        if self.rebuild:
+            self.postings = DedupIndex(self.postings.path)
+        else:
+            self.postings.sync(self.output_path)
+        with self._worker_pool() as pool:
+            self.clean(pool)
+        
+        if self.rebuild or not self.output_path.exists():
+            self.save_cleaned_data()
+        else:
+            self.append_cleaned_data()
         
         print("\n" + "="*60)
         print("✅ DATA PROCESSING COMPLETED")
@@ -242,6 +349,156 @@ class DataProcessor:
         
         return self
     
+    def clean(self, pool=None):
+        """Deduplicate and run the cleaning steps, in ``pool`` if given (see transform_parallel)"""
+        if pool is not None:
+            return self.transform_parallel(pool)
+        return (self.remove_duplicates()
+                    .clean_salary()
+                    .categorize_skills()
+                    .extract_job_groups()
+                    .extract_experience_level()
+                    .clean_location())
+    
+    def transform(self):
+        """The row-wise cleaning steps (no shared state, so they can run on any partition)"""
+        return (self.clean_salary()
+                    .parse_skill_columns()
+                    .extract_job_groups()
+                    .extract_experience_level()
+                    .clean_location())
+    
+    def transform_parallel(self, pool: ProcessPoolExecutor):
+        """Run ``transform`` on partitions of the data in worker processes
+        
+        Only the columns the steps use travel to the workers, and only the
+        columns they add or rewrite come back. The partitions are merged
+        back in input order, then duplicates are removed over the whole
+        merged data and the skill lists are encoded here, against the one
+        shared vocabulary. The output is identical to the serial steps.
+        """
+        n_parts = max(1, min(len(self.df), self.workers * PARTITIONS_PER_WORKER))
+        print(f"⚙️  Transforming {len(self.df):,} records in {n_parts} partitions "
+              f"on {self.workers} workers...")
+        inputs = [col for col in TRANSFORM_READS + SKILL_LIST_COLUMNS + ['city']
+                  if col in self.df.columns]
+        partitions = np.array_split(np.arange(len(self.df)), n_parts)
+        transformed = pd.concat(pool.map(_transform_partition,
+                                         (self.df[inputs].iloc[rows] for rows in partitions)))
+        for col in transformed.columns:
+            self.df[col] = transformed[col]
+        print(f"✓ Transformed {len(self.df):,} records")
+        return self.remove_duplicates().categorize_skills()
+    
+    def _worker_pool(self):
+        """Process pool for ``workers`` > 1, else a context yielding None"""
+        if self.workers > 1:
+            return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return contextlib.nullcontext()
+    
+    def process_stream(self):
+        """Run the pipeline chunk by chunk, for raw dumps larger than memory
+        
+        Every chunk goes through the same steps and is written as its own
+        part file, so only one chunk of postings is held at a time.
+        Duplicates are dropped across chunks by the dedup index; it and the
+        manifest are saved after every chunk (an interrupted run resumes with
+        ``incremental``), and the skill vocabulary and salary sketches are
+        updated as chunks are written. Chunks are appended to the output,
+        except with ``rebuild``, where the first one replaces it.
+        
+        After each chunk, ``chunk_size`` is fitted to ``memory_limit_mb``
+        (see ``_fit_chunk_size``).
+        """
+        print("\n" + "="*60)
+        print("🚀 STARTING STREAMING DATA PROCESSING PIPELINE")
+        print("="*60 + "\n")
+        print(f"📂 Streaming {', '.join(map(str, self.input_files()))} in chunks of "
+              f"{self.chunk_size:,} rows (memory cap {self.memory_limit_mb:,} MB)")
+        
+        rebuild_sketches = False
+        if not self.rebuild:
+            self.manifest.sync(self.output_path)
+            self.postings.sync(self.output_path)
+            rebuild_sketches = not self.sketches.load().is_current(self.output_path)
+        else:
+            self.manifest = VersionedHashIndex(self.manifest.path)
+            self.postings = DedupIndex(self.postings.path)
+            self.sketches = SalarySketches(self.sketches.path)
+        
+        self.run_stats = {'chunks': 0, 'rows_read': 0, 'rows_written': 0}
+        written = False
+        with self._worker_pool() as pool:
+            for chunk in self.read_chunks():
+                raw_hashes = row_hashes(chunk)
+                rows_read = len(chunk)
+                if self.incremental:
+                    chunk = chunk[~self.manifest.contains(raw_hashes)].reset_index(drop=True)
+                # Keep no other reference: a live parent frame would make every
+                # column the steps assign to a row subset of it a chained assignment
+                self.df, chunk = chunk, None
+                
+                if len(self.df) > 0:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        self.clean(pool)
+                
+                if len(self.df) > 0:
+                    if written or not self.rebuild:
+                        append_processed(self.df, self.output_path)
+                    else:
+                        save_processed(self.df, self.output_path)
+                    written = True
+                    self._record_postings()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        self._record_vocabulary()
+                    if not rebuild_sketches:
+                        self.sketches.add(self.df)
+                self.manifest.add(raw_hashes).save(data_fingerprint(self.output_path))
+                
+                self.run_stats['chunks'] += 1
+                self.run_stats['rows_read'] += rows_read
+                self.run_stats['rows_written'] += len(self.df)
+                print(f"✓ Chunk {self.run_stats['chunks']}: {rows_read:,} rows read, "
+                      f"{len(self.df):,} written (RSS {format_mb(current_rss_mb())})")
+                self._fit_chunk_size(self.df)
+        
+        if rebuild_sketches and self.output_path.exists():
+            self.sketches = SalarySketches.from_frame(
+                load_processed(self.output_path, columns=SKETCH_KEYS + ['salary_numeric']),
+                self.sketches.path)
+        if written or rebuild_sketches:
+            self._record_sketches()
+        
+        self.run_stats['peak_rss_mb'] = peak_rss_mb()
+        print(f"✓ Streamed {self.run_stats['rows_read']:,} rows in {self.run_stats['chunks']} chunks, "
+              f"{self.run_stats['rows_written']:,} written to {self.output_path}")
+        print(f"✓ Peak RSS: {format_mb(self.run_stats['peak_rss_mb'])} "
+              f"(cap {self.memory_limit_mb:,} MB)")
+        
+        print("\n" + "="*60)
+        print("✅ STREAMING DATA PROCESSING COMPLETED")
+        print("="*60 + "\n")
+        
+        return self
+    
+    def _fit_chunk_size(self, chunk):
+        """Shrink ``chunk_size`` to stay under the memory cap
+        
+        A chunk may take up to a quarter of the cap (the rest is headroom
+        for the copies made by the steps and the writer); the size is
+        halved whenever the process RSS is above the cap.
+        """
+        size = self.chunk_size
+        if len(chunk) > 0:
+            row_bytes = chunk.memory_usage(deep=True).sum() / len(chunk)
+            size = min(size, int(self.memory_limit_mb * 2**20 / 4 / row_bytes))
+        rss = current_rss_mb()
+        if rss is not None and rss > self.memory_limit_mb and self.chunk_size > MIN_CHUNK_SIZE:
+            size = min(size, self.chunk_size // 2)
+            print(f"⚠️  RSS {format_mb(rss)} above the {self.memory_limit_mb:,} MB cap, "
+                  f"halving chunks to {max(size, MIN_CHUNK_SIZE):,} rows")
+        self.chunk_size = max(size, MIN_CHUNK_SIZE)
+    
     def get_summary(self):
         """Get summary statistics of cleaned data"""
         if self.df is None:
@@ -250,6 +507,9 @@ class DataProcessor:
         
         print("\n📊 DATA SUMMARY")
         print("-" * 60)
+        if self.run_stats:
+            self._print_stream_summary()
+            return
         print(f"Total records: {len(self.df)}")
         print(f"Columns: {len(self.df.columns)}")
         print(f"Date range: {self.df.get('post_dates_formatted', pd.Series()).min()} to {self.df.get('post_dates_formatted', pd.Series()).max()}")
@@ -258,11 +518,239 @@ class DataProcessor:
         print(f"\nCities: {self.df['city'].nunique()}")
         print(self.df['city'].value_counts())
         print(f"\nSalary data: {self.df['salary_numeric'].notna().sum()} records with salary info")
+        if self.skill_lists:
+            memory = skill_memory_report(self.df, list(self.skill_lists)).iloc[-1]
+            print(f"Skill lists: {memory['list_bytes'] / 1e3:,.0f} KB as Python lists, "
+                  f"{memory['array_bytes'] / 1e3:,.0f} KB as int32 skill IDs")
+        print(f"Peak RSS: {format_mb(peak_rss_mb())}")
         print("-" * 60)
+    
+    def _print_stream_summary(self):
+        """Summary of a streaming run (only the last chunk is in memory, totals come from the sketches)"""
+        totals = self.sketches.summary()
+        print(f"Chunks: {self.run_stats['chunks']} (last {self.chunk_size:,} rows)")
+        print(f"Rows read: {self.run_stats['rows_read']:,}, written: {self.run_stats['rows_written']:,}")
+        print(f"Total records in output: {int(totals['count']):,}")
+        job_groups = self.sketches.rollup('job_group')['count']
+        print(f"\nJob groups: {len(job_groups)}")
+        print(job_groups.sort_values(ascending=False, kind='stable').head(10))
+        cities = self.sketches.rollup('city')['count']
+        print(f"\nCities: {len(cities)}")
+        print(cities.sort_values(ascending=False, kind='stable'))
+        print(f"\nSalary data: {int(totals['salary_count'])} records with salary info")
+        print(f"Peak RSS: {format_mb(self.run_stats['peak_rss_mb'])} "
+              f"(cap {self.memory_limit_mb:,} MB)")
+        print("-" * 60)
+
+
+
+def synthetic_raw(n_rows: int, seed: int = 0, duplicate_rate: float = 0.05,
+                  source=None) -> pd.DataFrame:
+    """Synthetic raw crawl rows with the schema and values of the real data
+    
+    Every raw column of the processed dataset (``source``) is resampled
+    independently, so values, salary strings and skill list texts are real
+    but their combinations are new. Titles get a posting number to make
+    postings distinct; ``duplicate_rate`` of the rows then repeat the
+    posting (title, company, location) of a random row.
+    """
+    real = load_processed(source)
+    derived = set(SALARY_COLUMNS) | {'salary_numeric', 'job_group', 'level', 'city'}
+    rng = np.random.default_rng(seed)
+    raw = pd.DataFrame({
+        col: real[col].astype(object).to_numpy()[rng.integers(0, len(real), n_rows)]
+        for col in real.columns if col not in derived
+    })
+    for col in SKILL_LIST_COLUMNS:
+        if col in raw.columns:
+            raw[col] = [str(value) for value in raw[col]]
+    
+    raw['job_names'] = raw['job_names'] + ' #' + pd.Series(np.arange(n_rows)).astype(str)
+    duplicate = np.flatnonzero(rng.random(n_rows) < duplicate_rate)
+    raw.loc[duplicate, POSTING_COLUMNS] = \
+        raw[POSTING_COLUMNS].to_numpy()[rng.integers(0, n_rows, len(duplicate))]
+    return raw
+
+
+def benchmark_workers(raw: pd.DataFrame, workers=(1, 2, 4, 8)) -> pd.DataFrame:
+    """Time of the dedup and cleaning steps on ``raw`` per worker count
+    
+    Includes starting the pool and shipping partitions to and from the
+    workers; reading and writing files is not timed.
+    """
+    rows = []
+    for n in workers:
+        processor = DataProcessor(workers=n)
+        processor.df = raw.copy(deep=False)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), processor._worker_pool() as pool:
+            processor.clean(pool)
+        elapsed = time.perf_counter() - start
+        rows.append({'workers': n, 'seconds': elapsed, 'rows_per_s': len(raw) / elapsed,
+                     'records': len(processor.df)})
+    result = pd.DataFrame(rows)
+    result['speedup'] = result['seconds'].iloc[0] / result['seconds']
+    return result
+
+
+def benchmark_stream(raw: pd.DataFrame, chunk_size: int = PROCESSING_CHUNK_SIZE,
+                     workers: int = 1) -> pd.DataFrame:
+    """Time a full ``--stream`` run over ``raw`` in a scratch directory
+    
+    Chained assignment warnings (pandas < 3) are raised as errors, so a
+    step writing into a view of a chunk fails the run.
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch = Path(scratch)
+        raw.to_csv(scratch / 'raw.csv', index=False)
+        processor = DataProcessor(input_path=scratch / 'raw.csv',
+                                  output_path=scratch / 'clean_data.parquet',
+                                  manifest_path=scratch / 'raw_manifest.npz',
+                                  vocabulary_path=scratch / 'skill_vocabulary.json',
+                                  sketches_path=scratch / 'salary_sketches.npz',
+                                  dedup_index_path=scratch / 'dedup_index.npz',
+                                  chunk_size=chunk_size, workers=workers)
+        start = time.perf_counter()
+        with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+            if hasattr(pd.errors, 'SettingWithCopyWarning'):
+                warnings.simplefilter('error', pd.errors.SettingWithCopyWarning)
+            processor.process_pipeline()
+        elapsed = time.perf_counter() - start
+    stats = processor.run_stats
+    return pd.DataFrame([{'chunk_size': chunk_size, 'chunks': stats['chunks'],
+                          'records': stats['rows_written'], 'seconds': elapsed,
+                          'rows_per_s': stats['rows_read'] / elapsed,
+                          'peak_rss_mb': stats['peak_rss_mb']}])
+
+
+def _reference_level(row) -> str:
+    """Row-wise level rules that extract_experience_level vectorizes (parity reference)"""
+    if 'position_names' in row and pd.notna(row['position_names']):
+        pos = str(row['position_names']).lower()
+        if any(x in pos for x in ['fresher', 'intern', 'entry']):
+            return 'fresher'
+        elif any(x in pos for x in ['junior', 'jr']):
+            return 'junior'
+        elif any(x in pos for x in ['senior', 'sr']):
+            return 'senior'
+        elif any(x in pos for x in ['lead', 'principal', 'staff']):
+            return 'lead'
+        elif any(x in pos for x in ['manager', 'director', 'head']):
+            return 'manager'
+    
+    job_name = str(row.get('job_names', '')).lower()
+    if any(x in job_name for x in ['senior', 'sr.']):
+        return 'senior'
+    elif any(x in job_name for x in ['junior', 'jr.']):
+        return 'junior'
+    elif any(x in job_name for x in ['lead', 'principal']):
+        return 'lead'
+    elif any(x in job_name for x in ['manager', 'head', 'director']):
+        return 'manager'
+    else:
+        return 'mid'
+
+
+def benchmark_levels(df: pd.DataFrame, repeat: int = 3) -> pd.DataFrame:
+    """Time the row-wise level rules against extract_experience_level
+    
+    Also checks that both assign the same level to every row.
+    """
+    processor = DataProcessor()
+    
+    def vectorized():
+        processor.df = df.copy(deep=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor.extract_experience_level()
+        return processor.df['level'].tolist()
+    
+    timings = {}
+    for name, run in [('row_apply', lambda: df.apply(_reference_level, axis=1).tolist()),
+                      ('np_select', vectorized)]:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = (best, result)
+    
+    assert timings['np_select'][1] == timings['row_apply'][1], \
+        "vectorized levels differ from the row-wise rules"
+    
+    baseline = timings['row_apply'][0]
+    return pd.DataFrame([
+        {'method': name, 'seconds': best, 'rows_per_sec': len(df) / best,
+         'speedup': baseline / best}
+        for name, (best, _) in timings.items()
+    ])
+
+
+def _init_worker():
+    global _worker_processor
+    _worker_processor = DataProcessor()
+
+
+def _transform_partition(df: pd.DataFrame) -> pd.DataFrame:
+    _worker_processor.df = df
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker_processor.transform()
+    return _worker_processor.df.drop(columns=TRANSFORM_READS, errors='ignore')
 
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Process raw job data")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true',
+                      help="Only process raw rows not seen by a previous run and append them")
+    mode.add_argument('--rebuild', action='store_true',
+                      help="Replace the output with the records of the input "
+                           "(default: append the postings not stored yet)")
+    parser.add_argument('--input', nargs='+', metavar='CSV',
+                        help="Raw CSV files to process (default: the configured crawl output)")
+    parser.add_argument('--stream', action='store_true',
+                        help="Process the input in chunks and write a partitioned Parquet store")
+    parser.add_argument('--chunk-size', type=int, default=PROCESSING_CHUNK_SIZE,
+                        help="Raw rows per chunk with --stream")
+    parser.add_argument('--memory-limit', type=int, default=PROCESSING_MEMORY_LIMIT_MB,
+                        metavar='MB', help="Memory cap with --stream (shrinks the chunks)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes for the cleaning steps (-1 for all cores)")
+    parser.add_argument('--benchmark', type=int, metavar='ROWS',
+                        help="Time 1/2/4/8 workers and a --stream run on ROWS synthetic raw rows "
+                             "instead of processing")
+    parser.add_argument('--check-levels', action='store_true',
+                        help="Check the level rules against the row-wise reference on the sample data")
+    args = parser.parse_args()
+    
+    if args.check_levels:
+        columns = ['position_names', 'job_names']
+        sample = pd.concat([pd.read_csv(CSV_PATH, dtype=RAW_DTYPE, usecols=columns),
+                            load_processed(columns=columns).astype(object),
+                            # Missing values and abbreviations at word edges
+                            pd.DataFrame({'position_names': [None, 'Sr Engineer', 'JR', 'Staffing', None],
+                                          'job_names': ['Sr. Dev', None, 'jr. QA', 'Head of IT', 'Dev']})],
+                           ignore_index=True)
+        print(f"🔧 Checking {len(sample):,} sample rows against the row-wise level rules...")
+        print(benchmark_levels(sample))
+        # Without position_names, only the title rules apply
+        benchmark_levels(sample[['job_names']])
+        print(f"✓ Vectorized levels match for all {len(sample):,} rows")
+        sys.exit()
+    
+    if args.benchmark:
+        print(f"🔧 Generating {args.benchmark:,} synthetic raw rows ({os.cpu_count()} CPUs)...")
+        raw = synthetic_raw(args.benchmark)
+        print(benchmark_workers(raw))
+        print(f"🔧 Streaming the same rows in chunks of {args.chunk_size:,}...")
+        print(benchmark_stream(raw, args.chunk_size))
+        sys.exit()
+    
     # Run processing pipeline
-    processor = DataProcessor()
+    processor = DataProcessor(input_path=args.input, incremental=args.incremental,
+                              rebuild=args.rebuild,
+                              chunk_size=args.chunk_size if args.stream else None,
+                              memory_limit_mb=args.memory_limit, workers=args.workers)
     processor.process_pipeline()
     processor.get_summary()
@@ -0,0 +1,139 @@
+"""
+Vectorized salary parsing
+Turn raw salary strings into numeric ranges (VND/month) in one pass
+"""
+import sys
+import re
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.config import USD_TO_VND
+
+
+# Thousands separators: "1,000", "45.000.000"
+_THOUSANDS_SEP = re.compile(r'(?<=\d)[,.](?=\d{3}(?!\d))')
+
+# "15-20", "1200$ - 1500$", "12tr - 15tr", "5 – 18"
+_RANGE = re.compile(
+    r'(?P<lo>\d+(?:\.\d+)?)\s*(?:\$|k|m|tr|triệu)?\s*(?:-|–|~|to)\s*\$?\s*(?P<hi>\d+(?:\.\d+)?)'
+)
+_NUMBER = re.compile(r'(?P<value>\d+(?:\.\d+)?)')
+
+_UP_TO = re.compile(r'\bup\s*to\b')
+_FROM = re.compile(r'\bfrom\b|\band above\b')
+_USD = re.compile(r'usd|\$')
+_VND = re.compile(r'vnd|vnđ|đ')
+_MILLION = re.compile(r'triệu|million|\d\s*mil\b|\d\s*m\b|\d\s*tr\b')
+_THOUSAND = re.compile(r'\d\s*k\b')
+_YEARLY = re.compile(r'\d\s*k?\s*/\s*(?:year|năm)|per year')
+_NEGOTIABLE = re.compile(r'nego|thỏa thuận|thoả thuận|discuss')
+# Benefits counted in months of salary ("Upto 30 month salary/year", "13th
+# month salary", "14 tháng lương"), not a salary figure
+_MONTH_SALARY = re.compile(
+    r'(?:\bup\s*to\s*)?\d+(?:st|nd|rd|th)?\s*(?:months?\s+salary|tháng\s+lương)(?:\s*/\s*(?:year|năm))?'
+)
+
+SALARY_COLUMNS = ['salary_min', 'salary_max', 'salary_mid', 'salary_currency', 'is_negotiable']
+
+
+def parse_salaries(salaries: pd.Series) -> pd.DataFrame:
+    """Parse a column of salary strings into ranges
+
+    Returns a DataFrame aligned with ``salaries`` holding ``salary_min``,
+    ``salary_max``, ``salary_mid`` (VND/month), ``salary_currency`` of the
+    posted figure ('VND' / 'USD') and an ``is_negotiable`` flag for
+    postings that do not state a number.
+    """
+    text = salaries.where(salaries != "Unknown").astype('string').str.lower()
+    text = text.str.replace(_THOUSANDS_SEP, '', regex=True)
+    text = text.str.replace(_MONTH_SALARY, '', regex=True)
+
+    # Bounds: explicit range first, otherwise a single number
+    ranges = text.str.extract(_RANGE)
+    single = text.str.extract(_NUMBER)['value']
+    lo = pd.to_numeric(ranges['lo'], errors='coerce').astype(float)
+    hi = pd.to_numeric(ranges['hi'], errors='coerce').astype(float)
+    value = pd.to_numeric(single, errors='coerce').astype(float)
+
+    is_range = lo.notna() & hi.notna()
+    up_to = _flag(text, _UP_TO) & ~is_range
+    from_ = _flag(text, _FROM) & ~is_range & ~up_to
+    exact = value.notna() & ~is_range & ~up_to & ~from_
+
+    low = lo.where(is_range, value.where(from_ | exact))
+    high = hi.where(is_range, value.where(up_to | exact))
+
+    # Units and currency
+    is_usd = _flag(text, _USD)
+    is_vnd = _flag(text, _VND)
+    is_million = _flag(text, _MILLION)
+    is_thousand = _flag(text, _THOUSAND)
+    is_yearly = _flag(text, _YEARLY)
+
+    reference = high.fillna(low)
+    # Bare numbers: full VND amounts, USD figures, or millions of VND
+    no_unit = ~(is_usd | is_vnd | is_million | is_thousand)
+    bare_usd = no_unit & (reference >= 100) & (reference < 100_000)
+    bare_million = no_unit & (reference < 100)
+    # "40k/year" without a currency is a USD package, like "$40k/year"
+    yearly_thousand = is_thousand & is_yearly & ~(is_usd | is_vnd | is_million)
+
+    multiplier = pd.Series(1.0, index=salaries.index)
+    multiplier = multiplier.mask(is_thousand, 1_000.0)
+    multiplier = multiplier.mask(is_million | bare_million, 1_000_000.0)
+    usd = (is_usd | bare_usd | yearly_thousand) & ~is_million
+    multiplier = multiplier.mask(usd, multiplier * USD_TO_VND)
+    multiplier = multiplier.mask(is_yearly, multiplier / 12)
+
+    salary_min = low * multiplier
+    salary_max = high * multiplier
+    has_value = salary_min.notna() | salary_max.notna()
+
+    result = pd.DataFrame(index=salaries.index)
+    result['salary_min'] = salary_min
+    result['salary_max'] = salary_max
+    result['salary_mid'] = pd.concat([salary_min, salary_max], axis=1).mean(axis=1)
+    result['salary_currency'] = pd.Series(
+        np.where(usd, 'USD', 'VND'), index=salaries.index
+    ).where(has_value)
+    result['is_negotiable'] = (text.notna() & ~has_value) | _flag(text, _NEGOTIABLE)
+
+    return result
+
+
+def _flag(text: pd.Series, pattern: re.Pattern) -> pd.Series:
+    """Boolean mask of rows matching a precompiled pattern"""
+    return text.str.contains(pattern, regex=True).fillna(False).astype(bool)
+
+
+# (salary text, salary_min, salary_max, salary_currency); None where NaN
+SAMPLE_SALARIES = [
+    ("15-20 triệu", 15_000_000, 20_000_000, 'VND'),
+    ("1200$ - 1500$", 1200 * USD_TO_VND, 1500 * USD_TO_VND, 'USD'),
+    ("Up to 2000$", None, 2000 * USD_TO_VND, 'USD'),
+    ("From 25,000,000 VND", 25_000_000, None, 'VND'),
+    ("30M", 30_000_000, 30_000_000, 'VND'),
+    ("Negotiable", None, None, None),
+    ("Upto 30 month salary/year", None, None, None),
+    ("13th month salary", None, None, None),
+    ("Up to 14 tháng lương", None, None, None),
+    ("1000-2000 USD + 13th month salary", 1000 * USD_TO_VND, 2000 * USD_TO_VND, 'USD'),
+    ("40k/year", 40_000 * USD_TO_VND / 12, 40_000 * USD_TO_VND / 12, 'USD'),
+    ("$40k/year", 40_000 * USD_TO_VND / 12, 40_000 * USD_TO_VND / 12, 'USD'),
+]
+
+
+def check_samples():
+    """Assert the parsed ranges of SAMPLE_SALARIES"""
+    parsed = parse_salaries(pd.Series([text for text, *_ in SAMPLE_SALARIES]))
+    for (text, lo, hi, currency), row in zip(SAMPLE_SALARIES, parsed.itertuples()):
+        got = tuple(None if pd.isna(v) else v
+                    for v in (row.salary_min, row.salary_max, row.salary_currency))
+        assert got == (lo, hi, currency), f"{text!r}: expected {(lo, hi, currency)}, got {got}"
+    print(f"✓ {len(SAMPLE_SALARIES)} sample salaries parse as expected")
+
+
+if __name__ == "__main__":
+    check_samples()
@@ -0,0 +1,97 @@
+"""
+Column dtypes of the processed dataset
+Low-cardinality text columns are categoricals (``level`` with the fixed
+JOB_LEVELS order) and salaries are float32. The storage layer applies the
+schema on every load and save, so filters and groupbys run on integer
+codes instead of Python strings.
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.config import JOB_LEVELS
+
+
+# Unordered categoricals (categories are whatever values occur)
+CATEGORY_COLUMNS = ['job_group', 'city', 'kind_jobs', 'company_names', 'locate_names',
+                    'salary_currency']
+
+# Ordered categoricals with a fixed category order
+ORDERED_COLUMNS = {'level': JOB_LEVELS}
+
+FLOAT32_COLUMNS = ['salary_numeric', 'salary_min', 'salary_max', 'salary_mid']
+
+
+def ordered_dtype(column: str, values: pd.Series = None) -> pd.CategoricalDtype:
+    """Ordered dtype of ``column``; unknown ``values`` are appended after the fixed order"""
+    categories = list(ORDERED_COLUMNS[column])
+    if values is not None:
+        extra = pd.Index(values.dropna().unique()).difference(categories)
+        categories += sorted(map(str, extra))
+    return pd.CategoricalDtype(categories, ordered=True)
+
+
+def categorical_columns() -> List[str]:
+    """Every column stored as a categorical"""
+    return CATEGORY_COLUMNS + list(ORDERED_COLUMNS)
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast the schema's columns present in ``df`` (in place) and return ``df``"""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in ORDERED_COLUMNS:
+        if col in df.columns:
+            values = df[col].astype(object) if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col]
+            dtype = ordered_dtype(col, values)
+            if df[col].dtype != dtype:
+                df[col] = values.astype(dtype)
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns and df[col].dtype != np.float32:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float32)
+    return df
+
+
+def benchmark_schema(df: pd.DataFrame, repeat: int = 5) -> pd.DataFrame:
+    """Memory and groupby time of ``df`` before and after apply_schema
+
+    ``df`` should be as read from storage without the schema, e.g.
+    ``pd.read_csv(CLEAN_CSV_PATH)``.
+    """
+    typed = apply_schema(df.copy())
+
+    def groupbys(frame):
+        for col in ['job_group', 'level', 'city']:
+            frame.groupby(col, observed=True)['salary_numeric'].agg(['mean', 'median', 'count'])
+        frame.groupby(['job_group', 'level', 'city'], observed=True).size()
+
+    rows = []
+    for name, frame in [('object', df), ('schema', typed)]:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            groupbys(frame)
+            best = min(best, time.perf_counter() - start)
+        columns = [c for c in categorical_columns() + FLOAT32_COLUMNS if c in frame.columns]
+        rows.append({'dtypes': name,
+                     'memory_mb': frame.memory_usage(deep=True).sum() / 1e6,
+                     'schema_columns_mb': frame[columns].memory_usage(deep=True).sum() / 1e6,
+                     'groupby_ms': best * 1000})
+    result = pd.DataFrame(rows)
+    result['speedup'] = result['groupby_ms'].iloc[0] / result['groupby_ms']
+    return result
+
+
+if __name__ == "__main__":
+    from config.config import CLEAN_CSV_PATH
+
+    raw = pd.read_csv(CLEAN_CSV_PATH, encoding='utf-8-sig', dtype=object)
+    raw['salary_numeric'] = pd.to_numeric(raw['salary_numeric'], errors='coerce')
+    print(f"✓ Loaded {len(raw)} records")
+    print("\n📦 Object dtypes vs schema:")
+    print(benchmark_schema(raw))
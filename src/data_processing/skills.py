@@ -0,0 +1,392 @@
+"""
+Shared skill representation
+Skills are parsed once at load time into lowercased, canonical, interned
+lists stored in the ``skills`` column, which every analysis reads directly.
+SkillVocabulary gives each canonical skill a stable integer ID,
+SkillLists stores a whole column of lists as flat int32 ID arrays and
+SkillMatrix turns the lists into a sparse job × skill matrix.
+"""
+import sys
+import json
+import hashlib
+import pandas as pd
+import numpy as np
+from scipy import sparse
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.config import SKILL_SYNONYMS, SKILL_VOCABULARY_PATH
+from src.data_processing.storage import parse_list
+
+
+SKILLS_COLUMN = 'skills'
+
+# Raw columns holding skill lists
+SKILL_LIST_COLUMNS = ['array_skills', 'programming_languages', 'frameworks',
+                      'tools', 'libraries', 'languages']
+
+# Scores available for ranking skill pairs (see SkillMatrix.top_pairs)
+PAIR_METRICS = ('count', 'jaccard', 'lift', 'pmi')
+
+# Changes whenever the synonym table does; stored with derived artifacts
+SYNONYMS_VERSION = hashlib.sha1(json.dumps(SKILL_SYNONYMS, sort_keys=True).encode()).hexdigest()
+
+
+def canonical_skill(skill) -> str:
+    """Lowercased canonical name of a skill ('ReactJS' -> 'react', see SKILL_SYNONYMS)"""
+    name = str(skill).strip().lower()
+    return sys.intern(SKILL_SYNONYMS.get(name, name))
+
+
+def normalize_skills(value) -> List[str]:
+    """Parse one skills field into a list of unique, canonical, interned names"""
+    seen = []
+    for skill in parse_list(value):
+        name = canonical_skill(skill)
+        if name and name not in seen:
+            seen.append(name)
+    return seen
+
+
+def add_skills_column(df: pd.DataFrame, source: str = 'array_skills') -> pd.DataFrame:
+    """Add the normalized ``skills`` column (in place) and return ``df``"""
+    if source in df.columns:
+        df[SKILLS_COLUMN] = df[source].map(normalize_skills)
+    else:
+        df[SKILLS_COLUMN] = [[] for _ in range(len(df))]
+    return df
+
+
+def get_skills(df: pd.DataFrame, source: str = 'array_skills') -> pd.Series:
+    """Normalized skills of each row
+
+    Uses the precomputed ``skills`` column when present, so callers passing
+    a frame from the loaders (or any filtered view of it) never re-parse.
+    """
+    if source == 'array_skills' and SKILLS_COLUMN in df.columns:
+        return df[SKILLS_COLUMN]
+    if source not in df.columns:
+        return pd.Series([[] for _ in range(len(df))], index=df.index)
+    return df[source].map(normalize_skills)
+
+
+def count_skills(skills: pd.Series) -> Counter:
+    """Count how many rows mention each skill"""
+    return Counter(chain.from_iterable(skills))
+
+
+class SkillVocabulary:
+    """Stable integer IDs for canonical skill names, persisted as JSON
+
+    The file holds the skill names in ID order. IDs are only ever
+    appended, so an ID keeps meaning the same skill across runs and
+    everything stored with it (matrices, indexes, caches) stays valid.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or SKILL_VOCABULARY_PATH)
+        self.names: List[str] = []
+        self.ids: dict = {}
+
+    def load(self):
+        """Load the vocabulary from disk (empty if the file does not exist)"""
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                self.names = [sys.intern(name) for name in json.load(f)]
+            self.ids = {name: i for i, name in enumerate(self.names)}
+        return self
+
+    def save(self):
+        """Write the vocabulary to disk"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.names, f, ensure_ascii=False, indent=0)
+        tmp.replace(self.path)
+        return self
+
+    def add(self, skills):
+        """Assign IDs to new skills (an iterable of names or of skill lists)"""
+        for item in skills:
+            for name in ([item] if isinstance(item, str) else item):
+                if name not in self.ids:
+                    self.ids[name] = len(self.names)
+                    self.names.append(name)
+        return self
+
+    def encode(self, skills) -> np.ndarray:
+        """IDs of the given skill names (-1 for unknown skills)"""
+        return np.fromiter((self.ids.get(name, -1) for name in skills),
+                           dtype=np.int32, count=len(skills))
+
+    def decode(self, ids) -> List[str]:
+        """Skill names of the given IDs"""
+        return [self.names[i] for i in ids]
+
+    def __len__(self):
+        return len(self.names)
+
+
+class SkillLists:
+    """A column of skill lists as CSR-style int32 arrays
+
+    The skills of row ``i`` are the IDs ``values[offsets[i]:offsets[i + 1]]``
+    of ``vocabulary``. Two flat arrays replace one Python list and one
+    string object per skill; lists are materialized only on access.
+    """
+
+    def __init__(self, values: np.ndarray, offsets: np.ndarray,
+                 vocabulary: SkillVocabulary, index: pd.Index = None):
+        self.values = values
+        self.offsets = offsets
+        self.vocabulary = vocabulary
+        self.index = index if index is not None else pd.RangeIndex(len(offsets) - 1)
+
+    @classmethod
+    def from_lists(cls, lists: pd.Series, vocabulary: SkillVocabulary) -> 'SkillLists':
+        """Encode a column of skill lists (raw or normalized), adding new skills to ``vocabulary``"""
+        lists = lists.map(normalize_skills)
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum(lists.map(len).to_numpy(dtype=np.int64), out=offsets[1:])
+        flat = list(chain.from_iterable(lists))
+        return cls(vocabulary.add(flat).encode(flat), offsets, vocabulary, lists.index)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> List[str]:
+        """Skill names of row ``i`` (by position)"""
+        return self.vocabulary.decode(self.ids(i))
+
+    def ids(self, i: int) -> np.ndarray:
+        """Skill IDs of row ``i`` (a view, no copy)"""
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Number of skills per row"""
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.offsets.nbytes
+
+    def rows_with(self, skill: str) -> np.ndarray:
+        """Boolean mask of the rows listing ``skill``"""
+        mask = np.zeros(len(self), dtype=bool)
+        skill_id = self.vocabulary.ids.get(canonical_skill(skill))
+        if skill_id is not None:
+            hits = np.flatnonzero(self.values == skill_id)
+            mask[np.searchsorted(self.offsets, hits, side='right') - 1] = True
+        return mask
+
+    def to_series(self) -> pd.Series:
+        """The column as a Series of lists of skill names"""
+        names = np.asarray(self.vocabulary.names, dtype=object)[self.values]
+        return pd.Series([list(row) for row in np.split(names, self.offsets[1:-1])]
+                         if len(self) else [], index=self.index, dtype=object)
+
+
+def encode_skill_columns(df: pd.DataFrame, vocabulary: SkillVocabulary,
+                         columns: List[str] = None) -> Dict[str, SkillLists]:
+    """SkillLists of every skill column of ``df`` over one shared vocabulary"""
+    columns = columns or SKILL_LIST_COLUMNS
+    return {col: SkillLists.from_lists(df[col], vocabulary) for col in columns if col in df.columns}
+
+
+def list_nbytes(lists: pd.Series) -> int:
+    """Memory held by a column of lists of strings
+
+    Counts every list object plus each distinct string object once
+    (interned names shared between rows are not double counted).
+    """
+    total = 0
+    strings = {}
+    for value in lists:
+        if isinstance(value, list):
+            total += sys.getsizeof(value)
+            for item in value:
+                strings[id(item)] = item
+    return total + sum(sys.getsizeof(item) for item in strings.values())
+
+
+def skill_memory_report(df: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
+    """Memory of each skill column as Python lists vs SkillLists arrays
+
+    The arrays share one vocabulary, whose names are counted once in a
+    separate row.
+    """
+    vocabulary = SkillVocabulary()
+    encoded = encode_skill_columns(df, vocabulary, columns)
+    rows = [{'column': col, 'rows': len(lists), 'skills': len(lists.values),
+             'list_bytes': list_nbytes(df[col]), 'array_bytes': lists.nbytes}
+            for col, lists in encoded.items()]
+    totals = {key: sum(row[key] for row in rows) for key in ('skills', 'list_bytes', 'array_bytes')}
+    rows.append({'column': '(vocabulary)', 'rows': None, 'skills': len(vocabulary), 'list_bytes': 0,
+                 'array_bytes': sum(sys.getsizeof(name) for name in vocabulary.names)
+                 + sys.getsizeof(vocabulary.names) + sys.getsizeof(vocabulary.ids)})
+    totals['array_bytes'] += rows[-1]['array_bytes']
+    rows.append({'column': 'total', 'rows': len(df), **totals})
+    report = pd.DataFrame(rows).astype({'rows': 'Int64'})
+    report['saved_pct'] = (1 - report['array_bytes'] / report['list_bytes'].where(report['list_bytes'] > 0)) * 100
+    return report
+
+
+class SkillMatrix:
+    """Sparse job × skill incidence matrix
+
+    Row ``i`` corresponds to ``index[i]`` of the frame it was built from,
+    column ``j`` to ``vocabulary[j]``. Entries are 1 where the posting
+    lists the skill, so column sums are posting counts and ``X.T @ X`` is
+    the skill co-occurrence matrix.
+    """
+
+    def __init__(self, matrix: sparse.csr_matrix, vocabulary: List[str], index: pd.Index):
+        self.matrix = matrix
+        self.vocabulary = list(vocabulary)
+        self.skill_index = {skill: j for j, skill in enumerate(self.vocabulary)}
+        self.index = index
+
+    @classmethod
+    def from_skills(cls, skills: pd.Series,
+                    vocabulary: Optional[SkillVocabulary] = None) -> 'SkillMatrix':
+        """Build from a Series of normalized skill lists (see ``get_skills``)
+
+        With a SkillVocabulary, column ``j`` is skill ID ``j`` (skills it
+        does not know yet are added in memory); otherwise columns follow
+        first appearance.
+        """
+        lengths = skills.map(len).to_numpy(dtype=np.int64)
+        flat = list(chain.from_iterable(skills))
+        if vocabulary is not None:
+            codes = vocabulary.add(flat).encode(flat)
+            vocabulary = vocabulary.names
+        else:
+            codes, vocabulary = pd.factorize(pd.Series(flat, dtype=object))
+
+        indptr = np.zeros(len(skills) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        matrix = sparse.csr_matrix(
+            (np.ones(len(codes), dtype=np.int32), codes.astype(np.int32), indptr),
+            shape=(len(skills), len(vocabulary)),
+        )
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+        return cls(matrix, vocabulary, skills.index)
+
+    @classmethod
+    def from_skill_lists(cls, lists: SkillLists) -> 'SkillMatrix':
+        """Build from SkillLists without copying (columns are skill IDs)"""
+        matrix = sparse.csr_matrix(
+            (np.ones(len(lists.values), dtype=np.int32), lists.values, lists.offsets),
+            shape=(len(lists), len(lists.vocabulary)),
+        )
+        return cls(matrix, lists.vocabulary.names, lists.index)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source: str = 'array_skills',
+                   vocabulary: Optional[SkillVocabulary] = None) -> 'SkillMatrix':
+        """Build from a DataFrame's skills"""
+        return cls.from_skills(get_skills(df, source), vocabulary)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    def row_mask(self, rows=None) -> Optional[np.ndarray]:
+        """Boolean row mask from a mask, or from index labels of a filtered frame"""
+        if rows is None:
+            return None
+        if isinstance(rows, pd.Index):
+            mask = np.zeros(self.matrix.shape[0], dtype=bool)
+            positions = self.index.get_indexer(rows)
+            mask[positions[positions >= 0]] = True
+            return mask
+        return np.asarray(rows, dtype=bool)
+
+    def select(self, rows=None) -> sparse.csr_matrix:
+        """Sub-matrix of the selected rows"""
+        mask = self.row_mask(rows)
+        return self.matrix if mask is None else self.matrix[mask]
+
+    def column_sums(self, rows=None) -> np.ndarray:
+        """Number of (selected) postings per skill"""
+        mask = self.row_mask(rows)
+        if mask is None:
+            return np.asarray(self.matrix.sum(axis=0)).ravel()
+        return self.matrix.T @ mask.astype(np.int32)
+
+    def skill_counts(self, rows=None) -> pd.Series:
+        """Posting count per skill, most frequent first (zero counts dropped)"""
+        counts = pd.Series(self.column_sums(rows), index=self.vocabulary, name='count')
+        counts = counts[counts > 0]
+        return counts.sort_values(ascending=False, kind='stable')
+
+    def cooccurrence(self, rows=None) -> sparse.csr_matrix:
+        """Skill × skill co-occurrence counts (diagonal holds skill counts)"""
+        X = self.select(rows)
+        return (X.T @ X).tocsr()
+
+    def top_pairs(self, rows=None, top_n: int = 20, metric: str = 'count',
+                  min_count: int = 1) -> pd.DataFrame:
+        """Most associated skill pairs
+
+        Args:
+            rows: Row mask or index labels to restrict to (all rows if None)
+            top_n: Number of pairs to return
+            metric: Ranking score - 'count', 'jaccard', 'lift' or 'pmi'
+            min_count: Ignore pairs seen together fewer times than this
+
+        Returns a DataFrame with skill_1, skill_2 (alphabetical), count and,
+        for normalized metrics, a column named after the metric.
+        """
+        if metric not in PAIR_METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {PAIR_METRICS}")
+
+        X = self.select(rows)
+        n_rows = X.shape[0]
+        gram = (X.T @ X).tocsr()
+        support = gram.diagonal().astype(np.float64)
+
+        pairs = sparse.triu(gram, k=1).tocoo()
+        keep = pairs.data >= min_count
+        i, j, count = pairs.row[keep], pairs.col[keep], pairs.data[keep].astype(np.float64)
+
+        if metric == 'count':
+            score = count
+        elif metric == 'jaccard':
+            score = count / (support[i] + support[j] - count)
+        else:
+            lift = count * n_rows / (support[i] * support[j])
+            score = lift if metric == 'lift' else np.log2(lift)
+
+        # Partial sort: only the top_n candidates get fully ordered
+        if len(score) > top_n:
+            top = np.argpartition(-score, top_n - 1)[:top_n]
+        else:
+            top = np.arange(len(score))
+        top = top[np.lexsort((-count[top], -score[top]))]
+
+        vocabulary = np.asarray(self.vocabulary, dtype=object)
+        first, second = vocabulary[i[top]], vocabulary[j[top]]
+        swap = first > second
+        result = pd.DataFrame({
+            'skill_1': np.where(swap, second, first),
+            'skill_2': np.where(swap, first, second),
+            'count': count[top].astype(int),
+        })
+        if metric != 'count':
+            result[metric] = score[top]
+        return result
+
+
+if __name__ == "__main__":
+    from src.data_processing.storage import load_processed
+
+    df = load_processed()
+    print(f"✓ Loaded {len(df)} records")
+    print("\n📦 Skill column memory, lists vs int32 arrays:")
+    print(skill_memory_report(df).to_string(index=False))
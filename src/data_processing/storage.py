@@ -0,0 +1,256 @@
+"""
+Storage backends for the processed dataset
+CSV (default) or columnar Parquet, selected by STORAGE_BACKEND in config
+
+The Parquet store is a directory of part files, so new batches can be
+appended without rewriting earlier ones.
+"""
+import sys
+import ast
+import hashlib
+import operator
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.config import STORAGE_BACKEND, CLEAN_CSV_PATH, CLEAN_PARQUET_PATH
+from src.data_processing.schema import apply_schema, categorical_columns
+
+
+# Columns holding lists of strings (stored as list<string> in Parquet)
+LIST_COLUMNS = ['array_skills', 'domain_arr', 'programming_languages', 'frameworks',
+                'tools', 'libraries', 'languages']
+
+# Low-cardinality columns stored dictionary-encoded (categoricals of the schema)
+CATEGORY_COLUMNS = categorical_columns()
+
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+_FILTER_OPS = {
+    '=': operator.eq, '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+
+def processed_path(backend: str = None) -> Path:
+    """Default path of the processed dataset for a backend"""
+    backend = backend or STORAGE_BACKEND
+    return CLEAN_PARQUET_PATH if backend == 'parquet' else CLEAN_CSV_PATH
+
+
+def data_fingerprint(path: Path = None, backend: str = None) -> str:
+    """Cheap version tag of the processed dataset
+
+    Hash of the path, size and modification time of the data file (every
+    part file for a Parquet store). Changes whenever the data is rewritten
+    or appended to, without reading the data itself. Empty string if the
+    dataset does not exist.
+    """
+    path = Path(path or processed_path(backend))
+    if not path.exists():
+        return ''
+    files = _parquet_parts(path) if path.is_dir() else [path]
+    digest = hashlib.sha1()
+    for file in files:
+        stat = file.stat()
+        digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def _backend_for(path: Path, backend: str = None) -> str:
+    if backend:
+        return backend
+    return 'parquet' if Path(path).suffix == '.parquet' else 'csv'
+
+
+def parse_list(value) -> list:
+    """Parse a stringified Python list (CSV storage) into a list
+
+    Plain comma-separated text, as found in the raw crawl, is split on commas.
+    """
+    if isinstance(value, list):
+        return value
+    if not isinstance(value, str):
+        return []
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return [s.strip() for s in value.split(',') if s.strip()]
+    return list(parsed) if isinstance(parsed, (list, tuple)) else []
+
+
+def load_processed(path: Path = None, columns: Optional[List[str]] = None,
+                   filters: Optional[List[tuple]] = None, backend: str = None) -> pd.DataFrame:
+    """Load the processed dataset
+
+    Args:
+        path: File to read (defaults to the configured backend's path)
+        columns: Only read these columns
+        filters: Row predicates as ``[(column, op, value), ...]`` (ANDed),
+            e.g. ``[('city', '=', 'Ha Noi')]``. Pushed down to the Parquet
+            reader; applied after reading for CSV.
+        backend: 'csv' or 'parquet' (inferred from the file suffix if omitted)
+
+    List columns are always returned as Python lists of strings, and the
+    dtypes of the schema module are applied.
+    """
+    path = Path(path or processed_path(backend))
+    backend = _backend_for(path, backend)
+
+    if backend == 'parquet':
+        tables = [_dictionary_encode(pq.read_table(part, columns=columns, memory_map=True,
+                                                   filters=_typed_filters(part, filters)))
+                  for part in _parquet_parts(path)]
+        table = pa.concat_tables(tables, promote_options='permissive')
+        df = table.to_pandas()
+        for col in LIST_COLUMNS:
+            if col in table.column_names:
+                df[col] = [v or [] for v in table.column(col).to_pylist()]
+        return apply_schema(df)
+
+    usecols = (lambda c: c in columns) if columns is not None else None
+    df = pd.read_csv(path, usecols=usecols, encoding='utf-8-sig')
+    if filters:
+        df = df[_filter_mask(df, filters)].reset_index(drop=True)
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(parse_list)
+    return apply_schema(df)
+
+
+def save_processed(df: pd.DataFrame, path: Path = None, backend: str = None) -> Path:
+    """Save the processed dataset with the configured backend (schema dtypes applied)"""
+    path = Path(path or processed_path(backend))
+    backend = _backend_for(path, backend)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df = apply_schema(df.copy(deep=False))
+
+    if backend == 'parquet':
+        if path.is_file():
+            path.unlink()
+        path.mkdir(exist_ok=True)
+        for part in _parquet_parts(path):
+            part.unlink()
+        _write_part(df, path)
+    else:
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    return path
+
+
+def append_processed(df: pd.DataFrame, path: Path = None, backend: str = None) -> Path:
+    """Append records to the processed dataset without rewriting it"""
+    path = Path(path or processed_path(backend))
+    backend = _backend_for(path, backend)
+
+    if not path.exists():
+        return save_processed(df, path, backend)
+    df = apply_schema(df.copy(deep=False))
+
+    if backend == 'parquet':
+        if path.is_file():
+            # Single-file store from an older layout: migrate to a directory once
+            return save_processed(pd.concat([load_processed(path), df], ignore_index=True),
+                                  path, backend)
+        _write_part(df, path)
+        return path
+
+    header = pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns
+    if set(df.columns) - set(header):
+        # New columns: the header has to change, so rewrite once
+        return save_processed(pd.concat([load_processed(path), df], ignore_index=True),
+                              path, backend)
+    df.reindex(columns=header).to_csv(path, mode='a', header=False, index=False,
+                                      encoding='utf-8')
+    return path
+
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Convert to an Arrow table with list<string> skills and dictionary categoricals"""
+    df = df.copy()
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = [[str(s) for s in parse_list(v)] for v in df[col]]
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Fixed types so part files written at different times share a schema
+    for cols, arrow_type in [(LIST_COLUMNS, pa.list_(pa.string())),
+                             (CATEGORY_COLUMNS, pa.dictionary(pa.int32(), pa.string()))]:
+        for col in cols:
+            if col in table.column_names:
+                idx = table.column_names.index(col)
+                table = table.set_column(idx, col, table.column(col).cast(arrow_type))
+    return table
+
+
+def _dictionary_encode(table: pa.Table) -> pa.Table:
+    """Dictionary-encode category columns stored as plain strings by older part files"""
+    for col in CATEGORY_COLUMNS:
+        if col in table.column_names and not pa.types.is_dictionary(table.schema.field(col).type):
+            idx = table.column_names.index(col)
+            column = table.column(col).cast(pa.string()).dictionary_encode()
+            table = table.set_column(idx, col, column.cast(pa.dictionary(pa.int32(), pa.string())))
+    return table
+
+
+def _parquet_parts(path: Path) -> List[Path]:
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    return sorted(path.glob('part-*.parquet'))
+
+
+def _write_part(df: pd.DataFrame, path: Path):
+    part = path / f"part-{len(_parquet_parts(path)):05d}.parquet"
+    pq.write_table(to_arrow(df), part, row_group_size=PARQUET_ROW_GROUP_SIZE)
+
+
+def convert_csv_to_parquet(csv_path: Path = None, parquet_path: Path = None) -> Path:
+    """One-off migration of the processed CSV to Parquet"""
+    csv_path = csv_path or CLEAN_CSV_PATH
+    parquet_path = parquet_path or CLEAN_PARQUET_PATH
+    df = load_processed(csv_path, backend='csv')
+    save_processed(df, parquet_path, backend='parquet')
+    print(f"✓ Converted {len(df)} records to {parquet_path}")
+    return parquet_path
+
+
+def _typed_filters(part: Path, filters: Optional[List[tuple]]) -> Optional[List[tuple]]:
+    """Filter values on float columns cast to the column's type in ``part``
+
+    Arrow refuses to compare a float32 column with an integer it cannot
+    represent exactly (e.g. 30_000_000); as float32 the comparison matches
+    the CSV backend, where pandas compares in the column's dtype.
+    """
+    if not filters:
+        return filters
+    schema = pq.read_schema(part)
+    typed = []
+    for column, op, value in filters:
+        if column in schema.names and pa.types.is_floating(schema.field(column).type):
+            field_type = schema.field(column).type
+            cast = lambda v: pa.scalar(v).cast(field_type, safe=False)
+            value = [cast(v) for v in value] if op in ('in', 'not in') else cast(value)
+        typed.append((column, op, value))
+    return typed
+
+
+def _filter_mask(df: pd.DataFrame, filters: List[tuple]) -> pd.Series:
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        if op == 'in':
+            mask &= df[column].isin(value)
+        elif op == 'not in':
+            mask &= ~df[column].isin(value)
+        else:
+            mask &= _FILTER_OPS[op](df[column], value).fillna(False)
+    return mask
+
+
+if __name__ == "__main__":
+    convert_csv_to_parquet()
@@ -0,0 +1,223 @@
+"""
+Nearest-neighbour indexes over L2-normalized sparse vectors
+ExactIndex scores every candidate; LSHIndex (random-hyperplane LSH) only
+scores the jobs that share a hash bucket with the query.
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+def top_n_indices(scores: np.ndarray, n: int) -> np.ndarray:
+    """Positions of the ``n`` highest scores, best first
+
+    Uses a partial sort (np.argpartition); ties are broken by position, as
+    in ``DataFrame.nlargest(keep='first')``.
+    """
+    n = min(n, len(scores))
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    threshold = scores[np.argpartition(-scores, n - 1)[n - 1]]
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:n - len(above)]
+    top = np.concatenate([above, ties])
+    return top[np.lexsort((top, -scores[top]))]
+
+
+class ExactIndex:
+    """Brute-force cosine search (rows and queries are L2-normalized)"""
+
+    kind = 'exact'
+
+    def __init__(self, matrix: sparse.csr_matrix):
+        self.matrix = matrix
+
+    def search(self, query: sparse.csr_matrix, k: int = 10,
+               mask: Optional[np.ndarray] = None, **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+        """Row positions and scores of the ``k`` best rows allowed by ``mask``"""
+        if mask is None or mask.all():
+            return self._rerank(None, query, k)
+        return self._rerank(np.flatnonzero(mask), query, k)
+
+    def _rerank(self, candidates: Optional[np.ndarray], query: sparse.csr_matrix, k: int):
+        """Top ``k`` of ``candidates`` by exact score (every row if None, without a copy)"""
+        rows = self.matrix if candidates is None else self.matrix[candidates]
+        scores = (rows @ query.T).toarray().ravel()
+        top = top_n_indices(scores, k)
+        return (top if candidates is None else candidates[top]), scores[top]
+
+    def save(self, path: Path, version: str = None):
+        """Nothing to persist: the index is the matrix itself"""
+
+    @classmethod
+    def load(cls, path: Path, matrix: sparse.csr_matrix, version: str = None,
+             **params) -> 'ExactIndex':
+        return cls(matrix)
+
+
+class LSHIndex(ExactIndex):
+    """Random-hyperplane LSH for cosine similarity
+
+    Each of ``n_tables`` tables hashes a vector to the signs of its
+    projections on ``n_bits`` random hyperplanes. Every table is stored as
+    the job positions sorted by hash key, so a bucket lookup is a binary
+    search. A query collects the jobs sharing a bucket with it in any
+    table, then reranks them exactly.
+
+    ``n_probes`` is the recall/latency knob: each table also probes the
+    buckets reached by flipping the query's ``n_probes`` least certain
+    bits (smallest |projection|), one at a time. More probes mean more
+    candidates, higher recall and slower queries.
+    """
+
+    kind = 'lsh'
+
+    def __init__(self, matrix: sparse.csr_matrix, n_tables: int = 12, n_bits: int = 10,
+                 n_probes: int = 2, seed: int = 42, planes: np.ndarray = None,
+                 order: np.ndarray = None, keys: np.ndarray = None):
+        super().__init__(matrix)
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.n_probes = n_probes
+        self.seed = seed
+        if planes is None:
+            rng = np.random.default_rng(seed)
+            planes = rng.standard_normal((matrix.shape[1], n_tables * n_bits)).astype(np.float32)
+            keys = self._keys(matrix, planes)
+            order = np.argsort(keys, axis=0, kind='stable')
+            keys = np.take_along_axis(keys, order, axis=0)
+        self.planes = planes
+        self.order = order
+        self.keys = keys
+        self._weights = np.left_shift(np.int64(1), np.arange(n_bits, dtype=np.int64))
+
+    def _keys(self, matrix: sparse.csr_matrix, planes: np.ndarray,
+              chunk_size: int = 100_000) -> np.ndarray:
+        """Hash key of every row in every table, shape (rows, n_tables)"""
+        keys = np.empty((matrix.shape[0], self.n_tables), dtype=np.int64)
+        weights = np.left_shift(np.int64(1), np.arange(self.n_bits, dtype=np.int64))
+        for start in range(0, matrix.shape[0], chunk_size):
+            projections = np.asarray(matrix[start:start + chunk_size] @ planes)
+            bits = (projections >= 0).reshape(-1, self.n_tables, self.n_bits)
+            keys[start:start + chunk_size] = bits @ weights
+        return keys
+
+    def candidates(self, query: sparse.csr_matrix, n_probes: int = None) -> np.ndarray:
+        """Positions of the jobs sharing a (probed) bucket with the query"""
+        n_probes = self.n_probes if n_probes is None else n_probes
+        projections = np.asarray(query @ self.planes).reshape(self.n_tables, self.n_bits)
+        bits = projections >= 0
+        keys = bits @ self._weights
+
+        # Probe keys per table: the query's own key, then one flipped bit each
+        flips = np.argsort(np.abs(projections), axis=1)[:, :min(n_probes, self.n_bits)]
+        probes = np.concatenate([keys[:, None], keys[:, None] ^ self._weights[flips]], axis=1)
+
+        found = []
+        for table in range(self.n_tables):
+            column = self.keys[:, table]
+            lo = np.searchsorted(column, probes[table], side='left')
+            hi = np.searchsorted(column, probes[table], side='right')
+            found.extend(self.order[a:b, table] for a, b in zip(lo, hi) if b > a)
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def search(self, query: sparse.csr_matrix, k: int = 10,
+               mask: Optional[np.ndarray] = None, n_probes: int = None,
+               **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top ``k`` rows allowed by ``mask``
+
+        Falls back to exact search when the query is empty or fewer than
+        ``k`` bucket candidates pass the mask.
+        """
+        if query.nnz == 0:
+            return super().search(query, k, mask)
+        candidates = self.candidates(query, n_probes)
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        if len(candidates) < k:
+            return super().search(query, k, mask)
+        return self._rerank(candidates, query, k)
+
+    def save(self, path: Path, version: str = None):
+        """Persist the hyperplanes and sorted tables (.npz), tagged with ``version``"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, planes=self.planes, order=self.order, keys=self.keys,
+                 params=np.array([self.n_tables, self.n_bits, self.n_probes, self.seed]),
+                 shape=np.array(self.matrix.shape), version=np.array([version or '']))
+
+    @classmethod
+    def load(cls, path: Path, matrix: sparse.csr_matrix, version: str = None,
+             **params) -> 'LSHIndex':
+        """Load the index saved at ``path``, or build and save it
+
+        ``version`` identifies the matrix (e.g. the data fingerprint it was
+        built from). A saved index is reused only if it was saved with the
+        same version, matrix shape and table and bit counts; the matrix
+        itself is never read, so a memory-mapped matrix stays unpaged.
+        Without a version the index is always rebuilt.
+        """
+        path = Path(path)
+        if version and path.exists():
+            with np.load(path) as saved:
+                n_tables, n_bits, n_probes, seed = saved['params'].tolist()
+                if ('version' in saved.files and saved['version'][0] == version
+                        and tuple(saved['shape'].tolist()) == matrix.shape
+                        and params.get('n_tables', n_tables) == n_tables
+                        and params.get('n_bits', n_bits) == n_bits):
+                    return cls(matrix, n_tables, n_bits, params.get('n_probes', n_probes), seed,
+                               planes=saved['planes'], order=saved['order'], keys=saved['keys'])
+        index = cls(matrix, **params)
+        index.save(path, version)
+        return index
+
+
+INDEXES = {'exact': ExactIndex, 'lsh': LSHIndex}
+
+
+def benchmark_index(index: ExactIndex, queries: sparse.csr_matrix, k: int = 10,
+                    probes=(0, 1, 2, 4, 8)) -> pd.DataFrame:
+    """Recall@k and latency of an ANN index against exact search
+
+    Each query row is searched exactly and with every ``n_probes`` value.
+    Jobs tied with the exact k-th score count as hits, since identical
+    skill sets give identical vectors.
+    """
+    exact = ExactIndex(index.matrix)
+
+    def run(search):
+        results, latencies = [], []
+        for i in range(queries.shape[0]):
+            start = time.perf_counter()
+            _, scores = search(queries[i])
+            latencies.append(time.perf_counter() - start)
+            results.append(scores)
+        return results, np.array(latencies) * 1000
+
+    truth, exact_ms = run(lambda q: exact.search(q, k))
+    rows = [{'method': 'exact', 'n_probes': None, 'recall@k': 1.0,
+             'p50_ms': np.percentile(exact_ms, 50), 'p99_ms': np.percentile(exact_ms, 99)}]
+    for n_probes in probes:
+        found, ms = run(lambda q: index.search(q, k, n_probes=n_probes))
+        recall = np.mean([np.sum(f >= t[-1] - 1e-9) / len(t) for f, t in zip(found, truth) if len(t)])
+        rows.append({'method': index.kind, 'n_probes': n_probes, 'recall@k': recall,
+                     'p50_ms': np.percentile(ms, 50), 'p99_ms': np.percentile(ms, 99)})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).parent.parent.parent))
+    from src.ml_models.job_recommender import JobRecommender
+
+    recommender = JobRecommender(index='lsh').load_data().build_features()
+    # Use a sample of the postings themselves as queries
+    rng = np.random.default_rng(0)
+    sample = rng.choice(recommender.tfidf_matrix.shape[0], size=200, replace=False)
+    print("\n⏱️ LSH vs exact search:")
+    print(benchmark_index(recommender.index, recommender.tfidf_matrix[sample]))
@@ -4,112 +4,344 @@ Content-based filtering using TF-IDF and cosine similarity
 """
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import ast
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer, ENGLISH_STOP_WORDS
 import sys
+import json
+import shutil
+import tempfile
+import argparse
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import CLEAN_CSV_PATH
+from config.config import (ML_CONFIG, RECOMMENDER_INDEX_PATH, RECOMMENDER_ARTIFACTS_DIR, OUTPUTS_DIR,
+                           SKILL_SYNONYMS)
+from src.data_processing.storage import load_processed, processed_path, data_fingerprint, parse_list
+from src.data_processing.skills import (add_skills_column, get_skills, normalize_skills, canonical_skill,
+                                        SKILLS_COLUMN, SYNONYMS_VERSION)
+from src.ml_models.ann_index import INDEXES, top_n_indices
+
+
+# English stop words, except canonical skill names ('golang' -> 'go')
+STOP_WORDS = sorted(ENGLISH_STOP_WORDS - set(SKILL_SYNONYMS.values()))
+
+# File in the artifacts directory naming the version subdirectory to load
+ARTIFACTS_POINTER = 'CURRENT'
+
+# Artifact versions kept on disk (older ones may still be mapped by readers)
+ARTIFACT_VERSIONS_KEPT = 2
 
 
 class JobRecommender:
-    """Recommend jobs based on user skills and preferences"""
+    """Recommend jobs based on user skills and preferences
     
-    def __init__(self):
+    After ``build_features`` the recommender is read-only: queries never
+    write to the instance, so one shared instance can serve many threads.
+    
+    ``index`` selects the nearest-neighbour search: 'exact' or 'lsh'
+    (see ann_index), defaulting to ML_CONFIG['job_recommender']['index'].
+    """
+    
+    def __init__(self, index=None):
         self.df = None
+        self.data_version = None
         self.tfidf_matrix = None
         self.vectorizer = None
+        self.index_kind = index or ML_CONFIG['job_recommender']['index']
+        self.index = None
+        self.levels = None
+        self.cities = None
+        self.salaries = None
         
-    def load_data(self, file_path=None):
-        """Load job data"""
-        file_path = file_path or CLEAN_CSV_PATH
-        self.df = pd.read_csv(file_path)
+    # Columns needed for scoring and displaying recommendations
+    COLUMNS = ['job_names', 'company_names', 'job_group', 'level',
+               'city', 'salary_numeric', 'array_skills']
+    
+    # Columns of a recommendation result
+    RESULT_COLUMNS = ['job_names', 'company_names', 'job_group', 'level',
+                      'city', 'salary_numeric', 'similarity', 'array_skills']
+    
+    # Memory budget for one chunk of the profiles × jobs score matrix
+    BATCH_CHUNK_BYTES = 256 * 1024 * 1024
+    
+    def load_data(self, file_path=None, df=None, version=None):
+        """Load job data (or use ``df``, e.g. a view of an already loaded dataset)
+        
+        ``version`` is the data fingerprint ``df`` was loaded at; it decides
+        whether saved artifacts still match (see load_artifacts).
+        """
+        if df is not None:
+            self.df = df if SKILLS_COLUMN in df.columns else add_skills_column(df.copy(deep=False))
+            self.data_version = version
+        else:
+            self.data_version = data_fingerprint(file_path or processed_path())
+            self.df = add_skills_column(load_processed(file_path, columns=self.COLUMNS))
         print(f"✓ Loaded {len(self.df)} jobs")
         return self
     
-    def build_features(self):
-        """Build TF-IDF features from job skills"""
+    def build_features(self, index_path=None):
+        """Build TF-IDF features from job skills and the search index
+        
+        The LSH index is loaded from ``index_path`` (RECOMMENDER_INDEX_PATH
+        by default) when it matches the features, otherwise built and saved.
+        """
         # Extract skills text
-        skills_text = []
-        for idx, row in self.df.iterrows():
-            try:
-                skills = ast.literal_eval(str(row.get('array_skills', '[]')))
-                if isinstance(skills, list):
-                    skills_text.append(' '.join([str(s).lower() for s in skills if s]))
-                else:
-                    skills_text.append('')
-            except:
-                skills_text.append('')
-        
-        self.df['skills_text'] = skills_text
+        self.df['skills_text'] = get_skills(self.df).map(' '.join)
         
         # Build TF-IDF matrix
-        self.vectorizer = TfidfVectorizer(
-            max_features=200,
-            stop_words='english'
-        )
+        self.vectorizer = self._vectorizer()
         self.tfidf_matrix = self.vectorizer.fit_transform(self.df['skills_text'])
         
         print(f"✓ Built TF-IDF matrix: {self.tfidf_matrix.shape}")
+        return self._prepare_search(index_path)
+    
+    @staticmethod
+    def _vectorizer(vocabulary=None):
+        return TfidfVectorizer(
+            max_features=200,
+            stop_words=STOP_WORDS,
+            vocabulary=vocabulary
+        )
+    
+    def _prepare_search(self, index_path=None):
+        """Filter arrays and search index over the TF-IDF matrix"""
+        # Filter columns as plain arrays, so queries only build index masks
+        self.levels = self.df['level'].to_numpy(dtype=object)
+        self.cities = self.df['city'].to_numpy(dtype=object)
+        self.salaries = pd.to_numeric(self.df['salary_numeric'], errors='coerce').to_numpy(dtype=np.float64)
+        for array in (self.levels, self.cities, self.salaries, self.tfidf_matrix.data,
+                      self.tfidf_matrix.indices, self.tfidf_matrix.indptr):
+            array.flags.writeable = False
+        
+        params = ML_CONFIG['job_recommender'].get(self.index_kind, {})
+        self.index = INDEXES[self.index_kind].load(index_path or RECOMMENDER_INDEX_PATH,
+                                                   self.tfidf_matrix, self.features_version(),
+                                                   **params)
+        
+        return self
+    
+    def features_version(self):
+        """Identity of the TF-IDF features: the data and synonym versions they are fit from
+        
+        The same values meta.json records (see load_artifacts); None when
+        the data version is unknown.
+        """
+        if not self.data_version:
+            return None
+        return f"{self.data_version}:{SYNONYMS_VERSION}"
+    
+    def save_artifacts(self, directory=None):
+        """Save the fitted features as .npy files for load_artifacts
+        
+        Vocabulary, IDF weights and the CSR arrays (data/indices/indptr) are
+        written separately so they can be memory-mapped; meta.json records
+        the shape, the data version and the skill synonym table they belong
+        to. Every save goes to a new version subdirectory, published by
+        atomically replacing the CURRENT pointer file: files that readers
+        may have mapped are never rewritten, and a reader never pairs
+        arrays and meta.json from different saves.
+        """
+        directory = Path(directory or RECOMMENDER_ARTIFACTS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        version_dir = Path(tempfile.mkdtemp(prefix='v', dir=directory))
+        
+        vocabulary = self.vectorizer.vocabulary_
+        arrays = {
+            'vocabulary': np.array(sorted(vocabulary, key=vocabulary.get)),
+            'idf': self.vectorizer.idf_,
+            'tfidf_data': self.tfidf_matrix.data,
+            'tfidf_indices': self.tfidf_matrix.indices,
+            'tfidf_indptr': self.tfidf_matrix.indptr,
+        }
+        for name, array in arrays.items():
+            np.save(version_dir / f"{name}.npy", array)
+        
+        meta = {'shape': list(self.tfidf_matrix.shape), 'version': self.data_version,
+                'synonyms': SYNONYMS_VERSION}
+        (version_dir / 'meta.json').write_text(json.dumps(meta))
+        
+        tmp = directory / f"{ARTIFACTS_POINTER}.tmp"
+        tmp.write_text(version_dir.name)
+        tmp.replace(directory / ARTIFACTS_POINTER)
+        self._prune_artifacts(directory)
+        
+        print(f"✓ Saved recommender artifacts to {version_dir}")
         return self
     
-    def recommend_by_skills(self, user_skills, top_n=10, level=None, city=None, min_salary=None):
-        """Recommend jobs based on user skills"""
+    @staticmethod
+    def _prune_artifacts(directory):
+        """Delete all but the newest ARTIFACT_VERSIONS_KEPT versions
+        
+        Unlinking keeps the pages of a mapped file alive until the reader
+        unmaps it; where the OS refuses (Windows), the version is left.
+        """
+        versions = sorted((path for path in directory.glob('v*') if path.is_dir()),
+                          key=lambda path: path.stat().st_mtime_ns)
+        for path in versions[:-ARTIFACT_VERSIONS_KEPT]:
+            shutil.rmtree(path, ignore_errors=True)
+    
+    def load_artifacts(self, directory=None, index_path=None):
+        """Load features saved by save_artifacts, memory-mapped
+        
+        The arrays are mapped read-only, so worker processes share the
+        pages through the OS cache. Returns False without loading anything
+        if the artifacts are missing or were built from other data.
+        """
+        pointer = Path(directory or RECOMMENDER_ARTIFACTS_DIR) / ARTIFACTS_POINTER
+        if not pointer.exists():
+            return False
+        directory = pointer.parent / pointer.read_text().strip()
+        meta_path = directory / 'meta.json'
+        if not meta_path.exists():
+            return False
+        meta = json.loads(meta_path.read_text())
+        if (meta['version'] != self.data_version or meta['shape'][0] != len(self.df)
+                or meta.get('synonyms') != SYNONYMS_VERSION):
+            return False
+        
+        def load(name):
+            return np.load(directory / f"{name}.npy", mmap_mode='r')
+        
+        self.tfidf_matrix = sparse.csr_matrix(
+            (load('tfidf_data'), load('tfidf_indices'), load('tfidf_indptr')),
+            shape=tuple(meta['shape']), copy=False
+        )
+        self.vectorizer = self._vectorizer({term: i for i, term in enumerate(load('vocabulary').tolist())})
+        self.vectorizer.idf_ = np.asarray(load('idf'))
+        
+        print(f"✓ Loaded TF-IDF matrix: {self.tfidf_matrix.shape} from {directory}")
+        self._prepare_search(index_path)
+        return True
+    
+    def build_or_load(self, directory=None, index_path=None):
+        """Load saved artifacts if they match the data, otherwise build and save them"""
+        if not self.load_artifacts(directory, index_path):
+            self.build_features(index_path)
+            self.save_artifacts(directory)
+        return self
+    
+    def candidate_mask(self, level=None, city=None, min_salary=None):
+        """Boolean mask of the jobs matching the preferences"""
+        mask = np.ones(len(self.levels), dtype=bool)
+        if level:
+            mask &= self.levels == level
+        if city:
+            mask &= self.cities == city
+        if min_salary:
+            with np.errstate(invalid='ignore'):
+                mask &= self.salaries >= min_salary
+        return mask
+    
+    def recommend_by_skills(self, user_skills, top_n=10, level=None, city=None, min_salary=None,
+                            n_probes=None):
+        """Recommend jobs based on user skills
+        
+        Filters are applied first as an index mask, then only the remaining
+        jobs are scored. TF-IDF rows are L2-normalized, so the dot product
+        with the user vector is the cosine similarity. ``n_probes`` trades
+        recall for latency with the LSH index (ignored by exact search).
+        """
         # Convert user skills to TF-IDF vector
-        user_skills_text = ' '.join([s.lower() for s in user_skills])
+        user_skills_text = ' '.join([canonical_skill(s) for s in user_skills])
         user_vector = self.vectorizer.transform([user_skills_text])
         
-        # Calculate cosine similarity
-        similarities = cosine_similarity(user_vector, self.tfidf_matrix).flatten()
+        # Score the jobs that pass the filters, keep the top N
+        mask = self.candidate_mask(level, city, min_salary)
+        rows, scores = self.index.search(user_vector, top_n, mask, n_probes=n_probes)
         
-        # Add similarity scores to dataframe
-        self.df['similarity'] = similarities
+        recommendations = self.df.iloc[rows]
+        recommendations = recommendations.assign(similarity=scores)
+        return recommendations[self.RESULT_COLUMNS]
+    
+    def recommend_batch(self, profiles, top_n=10, chunk_bytes=None):
+        """Recommend jobs for many candidate profiles at once
         
-        # Filter by preferences
-        filtered_df = self.df.copy()
+        Args:
+            profiles: List of dicts with the arguments of recommend_by_skills
+                ('user_skills' and optional 'level', 'city', 'min_salary'),
+                or plain skill lists
+            top_n: Recommendations per profile
+            chunk_bytes: Memory budget for one block of the dense
+                profiles × jobs score matrix (BATCH_CHUNK_BYTES by default)
         
-        if level:
-            filtered_df = filtered_df[filtered_df['level'] == level]
+        All profiles are vectorized in one call and scored against every
+        job with one sparse product per chunk of profiles, so memory stays
+        bounded however many profiles are passed. Results match
+        recommend_by_skills with exact search, profile by profile.
         
-        if city:
-            filtered_df = filtered_df[filtered_df['city'] == city]
+        Returns one DataFrame with a 'profile' column (position in
+        ``profiles``) and 'rank', followed by the usual result columns.
+        """
+        profiles = [p if isinstance(p, dict) else {'user_skills': p} for p in profiles]
+        if not profiles:
+            return pd.DataFrame(columns=['profile', 'rank'] + self.RESULT_COLUMNS)
+        texts = [' '.join(canonical_skill(s) for s in p.get('user_skills', [])) for p in profiles]
+        queries = self.vectorizer.transform(texts).tocsr()
+        jobs_t = self.tfidf_matrix.T.tocsc()
         
-        if min_salary:
-            filtered_df = filtered_df[
-                (filtered_df['salary_numeric'].notna()) & 
-                (filtered_df['salary_numeric'] >= min_salary)
-            ]
+        n_jobs = self.tfidf_matrix.shape[0]
+        chunk_bytes = chunk_bytes or self.BATCH_CHUNK_BYTES
+        chunk_size = max(1, chunk_bytes // (8 * max(n_jobs, 1)))
         
-        # Sort by similarity
-        recommendations = filtered_df.nlargest(top_n, 'similarity')
+        # One candidate list per distinct filter combination
+        candidate_sets = {}
+        for p in profiles:
+            key = (p.get('level'), p.get('city'), p.get('min_salary'))
+            if key not in candidate_sets:
+                candidate_sets[key] = (None if not any(key)
+                                       else np.flatnonzero(self.candidate_mask(*key)))
         
-        return recommendations[[
-            'job_names', 'company_names', 'job_group', 'level', 
-            'city', 'salary_numeric', 'similarity', 'array_skills'
-        ]]
+        profile_ids, ranks, rows, scores = [], [], [], []
+        for start in range(0, len(profiles), chunk_size):
+            block = (queries[start:start + chunk_size] @ jobs_t).toarray()
+            for offset, row_scores in enumerate(block):
+                p = profiles[start + offset]
+                candidates = candidate_sets[(p.get('level'), p.get('city'), p.get('min_salary'))]
+                if candidates is not None:
+                    row_scores = row_scores[candidates]
+                top = top_n_indices(row_scores, top_n)
+                profile_ids.append(np.full(len(top), start + offset))
+                ranks.append(np.arange(1, len(top) + 1))
+                rows.append(top if candidates is None else candidates[top])
+                scores.append(row_scores[top])
+        
+        recommendations = self.df.iloc[np.concatenate(rows)]
+        recommendations = recommendations.assign(similarity=np.concatenate(scores))
+        recommendations = recommendations[self.RESULT_COLUMNS]
+        recommendations.insert(0, 'rank', np.concatenate(ranks))
+        recommendations.insert(0, 'profile', np.concatenate(profile_ids))
+        return recommendations
     
-    def get_skill_match(self, user_skills, job_skills_str):
+    def get_skill_match(self, user_skills, job_skills):
         """Calculate skill match percentage"""
-        try:
-            job_skills = ast.literal_eval(str(job_skills_str))
-            if not isinstance(job_skills, list):
-                return 0
-            
-            job_skills_lower = [s.lower() for s in job_skills if s]
-            user_skills_lower = [s.lower() for s in user_skills]
-            
-            matched = len(set(user_skills_lower) & set(job_skills_lower))
-            total = len(job_skills_lower)
-            
-            return (matched / total * 100) if total > 0 else 0
-        except:
-            return 0
+        job_skills = normalize_skills(job_skills)
+        user_skills_lower = [canonical_skill(s) for s in user_skills]
+        
+        matched = len(set(user_skills_lower) & set(job_skills))
+        total = len(job_skills)
+        
+        return (matched / total * 100) if total > 0 else 0
 
 
 def main():
     """Demo recommendation system"""
+    parser = argparse.ArgumentParser(description="Job recommender demo")
+    parser.add_argument('--build', action='store_true',
+                        help="Build and save the recommender artifacts, then exit")
+    parser.add_argument('--batch', metavar='PROFILES_CSV',
+                        help="Recommend for every profile in a CSV (columns: skills, "
+                             "optional level, city, min_salary) and exit")
+    parser.add_argument('--top-n', type=int, default=10)
+    args = parser.parse_args()
+    
+    if args.build:
+        JobRecommender().load_data().build_features().save_artifacts()
+        return
+    
+    if args.batch:
+        run_batch(args.batch, args.top_n)
+        return
+    
     recommender = JobRecommender()
     recommender.load_data()
     recommender.build_features()
@@ -136,5 +368,27 @@ def main():
         print(f"   Match: {row['similarity']*100:.1f}%")
 
 
+def run_batch(profiles_path, top_n=10, output_path=None):
+    """Nightly batch: recommendations for every profile in a CSV"""
+    profiles_df = pd.read_csv(profiles_path)
+    profiles = [
+        {
+            'user_skills': parse_list(row['skills']),
+            'level': row.get('level') if pd.notna(row.get('level')) else None,
+            'city': row.get('city') if pd.notna(row.get('city')) else None,
+            'min_salary': row.get('min_salary') if pd.notna(row.get('min_salary')) else None,
+        }
+        for row in profiles_df.to_dict('records')
+    ]
+    
+    recommender = JobRecommender().load_data().build_or_load()
+    recommendations = recommender.recommend_batch(profiles, top_n=top_n)
+    
+    output_path = output_path or OUTPUTS_DIR / "batch_recommendations.csv"
+    recommendations.to_csv(output_path, index=False, encoding='utf-8-sig')
+    print(f"✓ Saved {len(recommendations)} recommendations for {len(profiles)} profiles to {output_path}")
+    return recommendations
+
+
 if __name__ == "__main__":
     main()
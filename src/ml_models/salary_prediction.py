@@ -16,7 +16,9 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import CLEAN_CSV_PATH, MODELS_DIR, OUTPUTS_DIR
+from config.config import MODELS_DIR, OUTPUTS_DIR
+from src.data_processing.storage import load_processed
+from src.data_processing.skills import add_skills_column, get_skills, canonical_skill
 
 
 class SalaryPredictor:
@@ -49,26 +51,16 @@ class SalaryPredictor:
             self.label_encoders[col] = le
         
         # Count skills
-        import ast
-        def count_skills(skills_str):
-            try:
-                skills = ast.literal_eval(skills_str) if isinstance(skills_str, str) else []
-                return len(skills) if isinstance(skills, list) else 0
-            except:
-                return 0
-        
-        if 'array_skills' in df_ml.columns:
-            features['skill_count'] = df_ml['array_skills'].apply(count_skills)
-        else:
-            features['skill_count'] = 0
+        skills = get_skills(df_ml)
+        features['skill_count'] = skills.map(len)
         
         # Has specific high-value skills
-        high_value_skills = ['aws', 'kubernetes', 'machine learning', 'ai', 'golang', 
+        high_value_skills = ['aws', 'kubernetes', 'machine learning', 'ai', 'go', 
                              'react', 'vue', 'docker', 'python', 'java']
         
         for skill in high_value_skills:
-            features[f'has_{skill.replace(" ", "_")}'] = df_ml['array_skills'].apply(
-                lambda x: 1 if skill in str(x).lower() else 0
+            features[f'has_{skill.replace(" ", "_")}'] = skills.map(
+                lambda x: 1 if skill in x else 0
             )
         
         # Target variable
@@ -205,10 +197,10 @@ class SalaryPredictor:
         })
         
         # Add skill flags
-        high_value_skills = ['aws', 'kubernetes', 'machine learning', 'ai', 'golang',
+        high_value_skills = ['aws', 'kubernetes', 'machine learning', 'ai', 'go',
                             'react', 'vue', 'docker', 'python', 'java']
         
-        skills_lower = [s.lower() for s in skills] if skills else []
+        skills_lower = [canonical_skill(s) for s in skills] if skills else []
         for skill in high_value_skills:
             input_data[f'has_{skill.replace(" ", "_")}'] = 1 if skill in skills_lower else 0
         
@@ -367,7 +359,7 @@ class SalaryPredictor:
 if __name__ == "__main__":
     # Load data
     print("📂 Loading data...")
-    df = pd.read_csv(CLEAN_CSV_PATH)
+    df = add_skills_column(load_processed())
     print(f"✓ Loaded {len(df)} records")
     
     # Create output directories
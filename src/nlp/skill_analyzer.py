@@ -10,7 +10,9 @@ import numpy as np
 from typing import List, Dict, Set
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import SKILL_CATEGORIES
+from config.config import SKILL_CATEGORIES, SKILL_SYNONYMS
+from src.data_processing.skills import SkillMatrix, canonical_skill
+from src.nlp.skill_matcher import SkillMatcher
 
 
 class SkillAnalyzer:
@@ -18,6 +20,7 @@ class SkillAnalyzer:
     
     def __init__(self):
         self.skill_database = self._build_skill_database()
+        self.matcher = SkillMatcher(self.skill_database, SKILL_SYNONYMS)
         self.skill_frequency = Counter()
         
     def _build_skill_database(self) -> Dict[str, Set[str]]:
@@ -101,7 +104,22 @@ class SkillAnalyzer:
         return skills_db
     
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
-        """Extract skills from text"""
+        """Extract skills from text in a single scan (see SkillMatcher)"""
+        return self.matcher.extract(text)
+    
+    def extract_skills_batch(self, texts: pd.Series, workers: int = 1) -> pd.DataFrame:
+        """Extract skills for a whole column, one list column per category
+        
+        ``workers`` > 1 (or -1 for all cores) shards the column across a
+        process pool.
+        """
+        return self.matcher.extract_batch(texts, workers=workers)
+    
+    def extract_skills_per_pattern(self, text: str) -> Dict[str, List[str]]:
+        """Reference implementation: one regex search per skill
+        
+        Matched spellings are reported under their canonical name.
+        """
         if pd.isna(text):
             return {category: [] for category in self.skill_database.keys()}
         
@@ -113,105 +131,86 @@ class SkillAnalyzer:
             for skill in skills:
                 # Use word boundary for better matching
                 pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.append(skill)
+                if re.search(pattern, text_lower) and canonical_skill(skill) not in found_skills:
+                    found_skills.append(canonical_skill(skill))
             extracted[category] = found_skills
         
         return extracted
     
     def analyze_skill_trends(self, df: pd.DataFrame, 
-                            skill_column: str = 'array_skills') -> pd.DataFrame:
-        """Analyze skill trends from job postings"""
-        print("📊 Analyzing skill trends...")
-        
-        all_skills = []
+                            skill_column: str = 'array_skills',
+                            skill_matrix: SkillMatrix = None) -> pd.DataFrame:
+        """Analyze skill trends from job postings
         
-        for idx, row in df.iterrows():
-            skills = row.get(skill_column, [])
-            if isinstance(skills, str):
-                try:
-                    import ast
-                    skills = ast.literal_eval(skills)
-                except:
-                    skills = []
-            
-            if isinstance(skills, list):
-                all_skills.extend([s.lower() for s in skills if s])
+        ``skill_matrix`` may be a prebuilt matrix over ``df`` or any frame
+        ``df`` was filtered from.
+        """
+        print("📊 Analyzing skill trends...")
         
         # Count skill frequency
-        skill_counts = Counter(all_skills)
+        skill_counts = self._skill_counts(df, skill_column, skill_matrix).head(50)
         
         # Create DataFrame
-        trend_df = pd.DataFrame([
-            {'skill': skill, 'count': count, 'percentage': count / len(df) * 100}
-            for skill, count in skill_counts.most_common(50)
-        ])
+        trend_df = pd.DataFrame({
+            'skill': skill_counts.index,
+            'count': skill_counts.values,
+            'percentage': skill_counts.values / len(df) * 100,
+        })
         
         return trend_df
     
-    def categorize_job_skills(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Categorize all skills in the dataset"""
+    def _skill_counts(self, df: pd.DataFrame, skill_column: str = 'array_skills',
+                      skill_matrix: SkillMatrix = None) -> pd.Series:
+        """Posting count per skill for the rows of ``df``"""
+        if skill_matrix is None:
+            return SkillMatrix.from_frame(df, skill_column).skill_counts()
+        return skill_matrix.skill_counts(df.index)
+    
+    def categorize_job_skills(self, df: pd.DataFrame, workers: int = 1) -> pd.DataFrame:
+        """Categorize all skills in the dataset (``workers`` as in extract_skills_batch)"""
         print("🔍 Categorizing job skills...")
         
-        # Initialize new columns
-        for category in self.skill_database.keys():
-            df[f'{category}_extracted'] = [[] for _ in range(len(df))]
+        # Combine all text fields
+        text_fields = [df[col].map(_as_text) for col in ['job_names', 'array_skills', 'exp_skills']
+                       if col in df.columns]
+        if text_fields:
+            combined_text = pd.concat(text_fields, axis=1).agg(' '.join, axis=1)
+        else:
+            combined_text = pd.Series('', index=df.index)
         
-        # Process each job
-        for idx, row in df.iterrows():
-            # Combine all text fields
-            text_fields = []
-            for col in ['job_names', 'array_skills', 'exp_skills']:
-                if col in df.columns and pd.notna(row[col]):
-                    text_fields.append(str(row[col]))
-            
-            combined_text = ' '.join(text_fields)
-            
-            # Extract skills
-            extracted = self.extract_skills(combined_text)
-            
-            # Assign to DataFrame
-            for category, skills in extracted.items():
-                df.at[idx, f'{category}_extracted'] = skills
+        # Extract skills for all jobs at once
+        extracted = self.extract_skills_batch(combined_text, workers=workers)
+        for category in self.skill_database.keys():
+            df[f'{category}_extracted'] = extracted[category]
         
         return df
     
     def get_skill_cooccurrence(self, df: pd.DataFrame, 
                                skill_column: str = 'array_skills',
-                               top_n: int = 20) -> pd.DataFrame:
-        """Analyze which skills often appear together"""
-        print("🔗 Analyzing skill co-occurrence...")
+                               top_n: int = 20,
+                               metric: str = 'count',
+                               min_count: int = 1,
+                               skill_matrix: SkillMatrix = None) -> pd.DataFrame:
+        """Analyze which skills often appear together
         
-        import ast
-        from itertools import combinations
-        
-        cooccurrence = Counter()
-        
-        for idx, row in df.iterrows():
-            skills = row.get(skill_column, [])
-            if isinstance(skills, str):
-                try:
-                    skills = ast.literal_eval(skills)
-                except:
-                    skills = []
-            
-            if isinstance(skills, list) and len(skills) > 1:
-                # Get all pairs of skills
-                skills_lower = [s.lower() for s in skills if s]
-                for pair in combinations(sorted(skills_lower), 2):
-                    cooccurrence[pair] += 1
+        Pairs are ranked by raw ``count`` or a normalized ``metric``
+        ('jaccard', 'lift', 'pmi'); use ``min_count`` to drop rare pairs,
+        which otherwise dominate lift and PMI.
+        """
+        print("🔗 Analyzing skill co-occurrence...")
         
-        # Create DataFrame
-        cooccur_df = pd.DataFrame([
-            {'skill_1': pair[0], 'skill_2': pair[1], 'count': count}
-            for pair, count in cooccurrence.most_common(top_n)
-        ])
+        if skill_matrix is None:
+            skill_matrix = SkillMatrix.from_frame(df, skill_column)
+            rows = None
+        else:
+            rows = df.index
         
-        return cooccur_df
+        return skill_matrix.top_pairs(rows, top_n=top_n, metric=metric, min_count=min_count)
     
     def generate_skill_recommendations(self, job_group: str, 
                                       current_skills: List[str],
-                                      df: pd.DataFrame) -> List[str]:
+                                      df: pd.DataFrame,
+                                      skill_matrix: SkillMatrix = None) -> List[str]:
         """Recommend skills to learn based on job group and current skills"""
         print(f"💡 Generating skill recommendations for {job_group}...")
         
@@ -221,27 +220,14 @@ class SkillAnalyzer:
         if len(group_df) == 0:
             return []
         
-        # Get all skills for this job group
-        all_skills = []
-        for idx, row in group_df.iterrows():
-            skills = row.get('array_skills', [])
-            if isinstance(skills, str):
-                try:
-                    import ast
-                    skills = ast.literal_eval(skills)
-                except:
-                    skills = []
-            if isinstance(skills, list):
-                all_skills.extend([s.lower() for s in skills if s])
-        
-        # Count frequency
-        skill_freq = Counter(all_skills)
+        # Count frequency of skills for this job group
+        skill_freq = self._skill_counts(group_df, skill_matrix=skill_matrix)
         
         # Remove skills already known
-        current_skills_lower = [s.lower() for s in current_skills]
+        current_skills_lower = [canonical_skill(s) for s in current_skills]
         recommendations = []
         
-        for skill, count in skill_freq.most_common(10):
+        for skill, count in skill_freq.head(10).items():
             if skill not in current_skills_lower:
                 recommendations.append({
                     'skill': skill,
@@ -252,14 +238,23 @@ class SkillAnalyzer:
         return recommendations[:5]  # Top 5 recommendations
 
 
+def _as_text(value) -> str:
+    """Text of one field for skill extraction (lists are comma-joined)"""
+    if isinstance(value, list):
+        return ', '.join(map(str, value))
+    return str(value) if pd.notna(value) else ''
+
+
 if __name__ == "__main__":
     # Test skill analyzer
-    from config.config import CLEAN_CSV_PATH
+    from src.data_processing.storage import load_processed
+    from src.data_processing.skills import add_skills_column
+    from src.nlp.skill_matcher import benchmark_extraction
     
     analyzer = SkillAnalyzer()
     
     # Load data
-    df = pd.read_csv(CLEAN_CSV_PATH)
+    df = add_skills_column(load_processed())
     print(f"Loaded {len(df)} records")
     
     # Analyze trends
@@ -271,3 +266,8 @@ if __name__ == "__main__":
     cooccur = analyzer.get_skill_cooccurrence(df)
     print("\n🔗 Skill Co-occurrence:")
     print(cooccur.head(10))
+    
+    # Extraction benchmark: per-skill regex vs single-pass matcher
+    texts = df['job_names'].fillna('') + ' ' + df['array_skills'].map(', '.join)
+    print("\n⏱️ Skill extraction benchmark:")
+    print(benchmark_extraction(analyzer, texts))
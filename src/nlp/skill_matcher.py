@@ -0,0 +1,179 @@
+"""
+Single-pass multi-pattern skill matcher
+All skills of the skill database are compiled into one trie-shaped regex
+"""
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set
+
+# Texts per task sent to a worker process
+CHUNK_SIZE = 2_000
+
+# Matcher of the current worker process, set once by _init_worker
+_worker_matcher: Optional['SkillMatcher'] = None
+
+
+class SkillMatcher:
+    """Find every skill of a skill database in one scan of the text
+
+    Matching follows the per-skill rule ``\\b<skill>\\b`` on the lowercased
+    text. The skills are merged into a prefix trie and compiled to a single
+    regex, wrapped in a zero-width lookahead so that every word boundary is
+    tried once and overlapping hits ("power bi" and "bi") are all reported.
+    At each position the trie prefers the longest skill; shorter skills
+    that are word-prefixes of it ("spring" in "spring boot") are added
+    from a precomputed table.
+
+    Spellings listed in ``synonyms`` are reported under their canonical
+    name ('golang' -> 'go'), which belongs to the categories of all its
+    spellings.
+    """
+
+    def __init__(self, skill_database: Dict[str, Set[str]],
+                 synonyms: Optional[Dict[str, str]] = None):
+        self.skill_database = skill_database
+        self.synonyms = synonyms or {}
+        self.categories = list(skill_database.keys())
+
+        self.skill_categories: Dict[str, List[str]] = {}
+        for category, skills in skill_database.items():
+            for skill in skills:
+                categories = self.skill_categories.setdefault(self.synonyms.get(skill, skill), [])
+                if category not in categories:
+                    categories.append(category)
+
+        skills = sorted(set().union(*skill_database.values()))
+        self.pattern = re.compile(r'\b(?=(' + _trie_regex(skills) + r'))')
+        self.implied = {skill: [other for other in skills if other != skill and
+                                re.match(re.escape(other) + r'\b', skill)]
+                        for skill in skills}
+
+    def find(self, text: str) -> Set[str]:
+        """All skills mentioned in ``text``"""
+        if pd.isna(text):
+            return set()
+        return self._expand(self.pattern.findall(str(text).lower()))
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        """Skills in ``text`` grouped by category"""
+        return self._by_category(self.find(text))
+
+    def extract_batch(self, texts: pd.Series, workers: int = 1,
+                      chunk_size: int = CHUNK_SIZE) -> pd.DataFrame:
+        """Extract skills for a whole column
+
+        Args:
+            texts: Texts to scan
+            workers: Worker processes (-1 for all cores). With more than one
+                worker the column is split into shards of ``chunk_size``
+                texts; each worker builds the matcher once and returns a
+                block of columns, concatenated in a single step.
+            chunk_size: Texts per shard
+
+        Returns a DataFrame aligned with ``texts`` holding one column of
+        skill lists per category.
+        """
+        workers = os.cpu_count() if workers == -1 else workers
+        if workers > 1 and len(texts) > chunk_size:
+            return self._extract_parallel(texts, workers, chunk_size)
+
+        hits = texts.astype('string').str.lower().str.findall(self.pattern)
+        rows = [self._by_category(self._expand(h) if isinstance(h, list) else set())
+                for h in hits]
+        return pd.DataFrame(rows, index=texts.index, columns=self.categories)
+
+    def _extract_parallel(self, texts: pd.Series, workers: int,
+                          chunk_size: int) -> pd.DataFrame:
+        n_chunks = -(-len(texts) // chunk_size)
+        shards = np.array_split(np.arange(len(texts)), n_chunks)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.skill_database, self.synonyms)) as pool:
+            blocks = list(pool.map(_extract_shard,
+                                   (texts.iloc[rows].reset_index(drop=True) for rows in shards)))
+        result = pd.concat(blocks, ignore_index=True)
+        result.index = texts.index
+        return result
+
+    def _expand(self, hits: List[str]) -> Set[str]:
+        found = set(hits)
+        for hit in found.copy():
+            found.update(self.implied[hit])
+        return {self.synonyms.get(skill, skill) for skill in found}
+
+    def _by_category(self, found: Set[str]) -> Dict[str, List[str]]:
+        extracted = {category: [] for category in self.categories}
+        for skill in sorted(found):
+            for category in self.skill_categories[skill]:
+                extracted[category].append(skill)
+        return extracted
+
+
+def _init_worker(skill_database: Dict[str, Set[str]], synonyms: Dict[str, str]):
+    global _worker_matcher
+    _worker_matcher = SkillMatcher(skill_database, synonyms)
+
+
+def _extract_shard(texts: pd.Series) -> pd.DataFrame:
+    return _worker_matcher.extract_batch(texts)
+
+
+def _trie_regex(words: List[str]) -> str:
+    """Regex alternation of ``words`` sharing common prefixes
+
+    Each word ends with ``\\b``. Longer continuations are listed before the
+    end of a word, so the longest skill with a valid boundary wins.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if '' in node:
+            branches.append(r'\b')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+def benchmark_extraction(analyzer, texts: pd.Series, repeat: int = 3) -> pd.DataFrame:
+    """Time per-skill regex extraction against the single-pass matcher
+
+    Also checks that both return the same skills for every text.
+    """
+    def per_skill(text):
+        return {category: sorted(skills) for category, skills in
+                analyzer.extract_skills_per_pattern(text).items()}
+
+    timings = {}
+    for name, run in [('per_skill_regex', lambda: [per_skill(t) for t in texts]),
+                      ('matcher', lambda: [analyzer.matcher.extract(t) for t in texts]),
+                      ('matcher_batch', lambda: analyzer.matcher.extract_batch(texts))]:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = (best, result)
+
+    expected = timings['per_skill_regex'][1]
+    batch = timings['matcher_batch'][1].to_dict('records')
+    assert timings['matcher'][1] == expected, "matcher results differ from per-skill regex"
+    assert batch == expected, "batch results differ from per-skill regex"
+
+    baseline = timings['per_skill_regex'][0]
+    return pd.DataFrame([
+        {'method': name, 'seconds': best, 'texts_per_sec': len(texts) / best,
+         'speedup': baseline / best}
+        for name, (best, _) in timings.items()
+    ])
@@ -8,9 +8,10 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
+from src.data_processing.skills import get_skills, count_skills
 
 
-def show_career_simulator(df):
+def show_career_simulator(df, sketches=None):
     """Career path simulation page"""
     
     st.markdown('<h2 class="sub-header">🚀 Mô phỏng lộ trình nghề nghiệp</h2>', unsafe_allow_html=True)
@@ -42,11 +43,15 @@ def show_career_simulator(df):
         years = st.slider("⏱️ Thời gian dự đoán (năm)", 1, 10, 5)
     
     if st.button("🚀 Mô phỏng lộ trình", use_container_width=True):
-        simulate_career_path(df, job_group, current_level, years)
+        simulate_career_path(df, job_group, current_level, years, sketches)
 
 
-def simulate_career_path(df, job_group, current_level, years):
-    """Generate and display career path simulation"""
+def simulate_career_path(df, job_group, current_level, years, sketches=None):
+    """Generate and display career path simulation
+    
+    ``sketches`` (an AggregateCube or SalarySketches of ``df``) answers the
+    salary mean and quartiles per level without scanning ``df``.
+    """
     
     # Define career levels hierarchy
     levels = ['fresher', 'junior', 'mid', 'senior', 'lead', 'manager']
@@ -60,16 +65,25 @@ def simulate_career_path(df, job_group, current_level, years):
         level = levels[level_idx]
         
         # Get salary data
-        salary_data = df[
-            (df['job_group'] == job_group) & 
-            (df['level'] == level) &
-            (df['salary_numeric'].notna())
-        ]
+        if sketches is not None:
+            summary = sketches.where(job_group=job_group, level=level).summary()
+        else:
+            salary_data = df[
+                (df['job_group'] == job_group) & 
+                (df['level'] == level) &
+                (df['salary_numeric'].notna())
+            ]['salary_numeric']
+            summary = pd.Series({
+                'salary_count': len(salary_data),
+                'mean': salary_data.mean(),
+                'p25': salary_data.quantile(0.25),
+                'p75': salary_data.quantile(0.75),
+            })
         
-        if len(salary_data) > 0:
-            avg_salary = salary_data['salary_numeric'].mean()
-            min_salary = salary_data['salary_numeric'].quantile(0.25)
-            max_salary = salary_data['salary_numeric'].quantile(0.75)
+        if summary['salary_count'] > 0:
+            avg_salary = summary['mean']
+            min_salary = summary['p25']
+            max_salary = summary['p75']
         else:
             # Estimate based on previous level
             avg_salary = 15_000_000 * (1.3 ** level_idx)
@@ -210,21 +224,9 @@ def simulate_career_path(df, job_group, current_level, years):
 
 def get_skills_for_level(job_group, level, df):
     """Get common skills for a job group and level"""
-    import ast
-    
     jobs = df[(df['job_group'] == job_group) & (df['level'] == level)]
     
-    all_skills = []
-    for _, row in jobs.iterrows():
-        try:
-            skills = ast.literal_eval(str(row.get('array_skills', '[]')))
-            if isinstance(skills, list):
-                all_skills.extend([s.lower() for s in skills if s])
-        except:
-            pass
-    
-    from collections import Counter
-    skill_counts = Counter(all_skills)
+    skill_counts = count_skills(get_skills(jobs))
     return [skill for skill, _ in skill_counts.most_common(10)]
 
 
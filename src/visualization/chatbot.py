@@ -6,6 +6,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from src.data_processing.skills import get_skills, count_skills
 
 
 def show_chatbot(df):
@@ -188,7 +189,7 @@ def generate_salary_response(df, question):
         response.append(f"- Khoảng lương: {salary_data.min()/1_000_000:.1f}M - {salary_data.max()/1_000_000:.1f}M\n")
         
         response.append("**Top 5 nghề lương cao:**")
-        salary_by_group = df[df['salary_numeric'].notna()].groupby('job_group')['salary_numeric'].mean().sort_values(ascending=False)
+        salary_by_group = df[df['salary_numeric'].notna()].groupby('job_group', observed=True)['salary_numeric'].mean().sort_values(ascending=False)
         for i, (job, salary) in enumerate(salary_by_group.head(5).items(), 1):
             response.append(f"{i}. {job}: {salary/1_000_000:.1f}M VND")
     
@@ -197,23 +198,11 @@ def generate_salary_response(df, question):
 
 def generate_skills_response(df, question):
     """Generate response about skills"""
-    import ast
-    from collections import Counter
-    
     response = []
     response.append("## 🎯 Phân tích kỹ năng\n")
     
-    # Extract all skills
-    all_skills = []
-    for _, row in df.iterrows():
-        try:
-            skills = ast.literal_eval(str(row.get('array_skills', '[]')))
-            if isinstance(skills, list):
-                all_skills.extend([s.lower() for s in skills if s])
-        except:
-            pass
-    
-    skill_counts = Counter(all_skills)
+    # Count all skills
+    skill_counts = count_skills(get_skills(df))
     
     response.append("**Top 15 kỹ năng được yêu cầu nhiều nhất:**\n")
     for i, (skill, count) in enumerate(skill_counts.most_common(15), 1):
@@ -246,7 +235,7 @@ def generate_market_response(df, question):
         response.append(f"{i}. {job}: {count:,} tin ({pct:.1f}%)")
     
     response.append("\n**Phân bố theo cấp độ:**")
-    level_counts = df['level'].value_counts()
+    level_counts = df['level'].value_counts().loc[lambda counts: counts > 0]
     for level, count in level_counts.items():
         pct = (count / len(df)) * 100
         response.append(f"- {level.capitalize()}: {count:,} ({pct:.1f}%)")
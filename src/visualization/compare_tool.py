@@ -6,6 +6,7 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from src.data_processing.skills import get_skills, count_skills
 
 
 def show_compare_tool(df):
@@ -197,8 +198,8 @@ def compare_cities(df):
         st.markdown("---")
         st.markdown("### 🎯 Phân bố nghề nghiệp")
         
-        job_dist1 = data1['job_group'].value_counts().head(10)
-        job_dist2 = data2['job_group'].value_counts().head(10)
+        job_dist1 = data1['job_group'].value_counts().loc[lambda counts: counts > 0].head(10)
+        job_dist2 = data2['job_group'].value_counts().loc[lambda counts: counts > 0].head(10)
         
         fig = go.Figure()
         fig.add_trace(go.Bar(name=city1, x=job_dist1.index, y=job_dist1.values, marker_color='#667eea'))
@@ -259,29 +260,17 @@ def compare_companies(df):
         
         with col1:
             st.markdown(f"**{company1}**")
-            jobs1 = data1['job_group'].value_counts()
+            jobs1 = data1['job_group'].value_counts().loc[lambda counts: counts > 0]
             for job, count in jobs1.items():
                 st.markdown(f"- {job}: {count}")
         
         with col2:
             st.markdown(f"**{company2}**")
-            jobs2 = data2['job_group'].value_counts()
+            jobs2 = data2['job_group'].value_counts().loc[lambda counts: counts > 0]
             for job, count in jobs2.items():
                 st.markdown(f"- {job}: {count}")
 
 
 def extract_top_skills(data, top_n=10):
     """Extract top N skills from job data"""
-    import ast
-    from collections import Counter
-    
-    all_skills = []
-    for _, row in data.iterrows():
-        try:
-            skills = ast.literal_eval(str(row.get('array_skills', '[]')))
-            if isinstance(skills, list):
-                all_skills.extend([s.lower() for s in skills if s])
-        except:
-            pass
-    
-    return Counter(all_skills).most_common(top_n)
+    return count_skills(get_skills(data)).most_common(top_n)
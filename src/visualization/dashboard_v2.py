@@ -10,11 +10,14 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 from collections import Counter
-import ast
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import CLEAN_CSV_PATH
+from src.data_processing.storage import processed_path, parse_list, data_fingerprint
+from src.data_processing.data_service import DataService
+from src.data_processing.skills import (add_skills_column, get_skills, count_skills, SkillMatrix,
+                                        SkillVocabulary, SKILLS_COLUMN)
 from src.analysis.salary_analytics import SalaryAnalyzer
+from src.analysis.aggregate_cube import AggregateCube
 from src.nlp.skill_analyzer import SkillAnalyzer
 from src.ml_models.job_recommender import JobRecommender
 from src.visualization.demo_scenarios import show_demo_scenarios
@@ -23,6 +26,11 @@ from src.visualization.compare_tool import show_compare_tool
 from src.visualization.export_tools import show_export_tools
 from src.visualization.chatbot import show_chatbot
 
+# Sessions share one DataFrame (see DataService); copy-on-write keeps their
+# views independent. Always on from pandas 3.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
 
 # Page config
 st.set_page_config(
@@ -156,59 +164,83 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-@st.cache_data(ttl=1)  # Cache 1 giây - force reload
-def load_data():
-    """Load and cache data"""
+def data_version():
+    """Fingerprint of the processed data file, used as the cache key of every loader"""
+    return data_fingerprint(processed_path())
+
+
+def prepare_data(df):
+    """Normalization applied once when the shared dataset is loaded"""
+    # Normalize city names (chuẩn hóa tên thành phố)
+    city_mapping = {
+        'Hà Nội': 'Ha Noi',
+        'Hồ Chí Minh': 'Ho Chi Minh',
+        'Đà Nẵng': 'Da Nang',
+        'Cần Thơ': 'Can Tho',
+        'Hải Phòng': 'Hai Phong'
+    }
+    if 'city' in df.columns:
+        df['city'] = df['city'].astype(object).replace(city_mapping).astype('category')
+    
+    # Parse skills once for every page
+    return add_skills_column(df)
+
+
+@st.cache_resource(max_entries=1)
+def load_service(version=None):
+    """One shared, read-only copy of the dataset per data version"""
+    return DataService(processed_path(), prepare=prepare_data).refresh()
+
+
+def load_data(version=None, columns=None):
+    """Zero-copy view of the shared dataset (optionally only the given columns)
+    
+    The file is only re-read after it changes on disk (see data_version).
+    """
+    data_path = processed_path()
     try:
-        df = pd.read_csv(CLEAN_CSV_PATH)
-        
-        # Normalize city names (chuẩn hóa tên thành phố)
-        city_mapping = {
-            'Hà Nội': 'Ha Noi',
-            'Hồ Chí Minh': 'Ho Chi Minh',
-            'Đà Nẵng': 'Da Nang',
-            'Cần Thơ': 'Can Tho',
-            'Hải Phòng': 'Hai Phong'
-        }
-        df['city'] = df['city'].replace(city_mapping)
-        
-        return df
+        return load_service(version).frame(columns)
     except FileNotFoundError:
-        st.error(f"❌ Không tìm thấy dữ liệu: {CLEAN_CSV_PATH}")
+        st.error(f"❌ Không tìm thấy dữ liệu: {data_path}")
         st.info("💡 File cần: data/processed/clean_data.csv")
         st.info("🔄 Chạy: `python src/crawler/ITViec_AI_demo.py` để tạo data")
         st.stop()
     except Exception as e:
         st.error(f"❌ Lỗi đọc dữ liệu: {e}")
-        st.info(f"📁 Path: {CLEAN_CSV_PATH}")
-        st.info(f"📊 Exists: {CLEAN_CSV_PATH.exists()}")
+        st.info(f"📁 Path: {data_path}")
+        st.info(f"📊 Exists: {data_path.exists()}")
         st.stop()
 
 
-@st.cache_resource
-def load_recommender():
-    """Load and cache recommender"""
+# Derived objects are shared by every session and keyed on the same data
+# version as load_data, so a data change rebuilds all of them together.
+
+@st.cache_resource(max_entries=1)
+def load_skill_matrix(version=None):
+    """Build and cache the job × skill matrix over the full dataset (columns are skill IDs)"""
+    return SkillMatrix.from_frame(load_data(version), vocabulary=SkillVocabulary().load())
+
+
+@st.cache_resource(max_entries=1)
+def load_cube(version=None):
+    """Build and cache the aggregate cube used by the overview, market and salary pages"""
+    return AggregateCube.from_frame(load_data(version))
+
+
+@st.cache_resource(max_entries=1)
+def load_recommender(version=None):
+    """Load and cache recommender (rebuilt when the data version changes)"""
     try:
         recommender = JobRecommender()
-        recommender.load_data()
-        recommender.build_features()
+        recommender.load_data(df=load_data(version, JobRecommender.COLUMNS + [SKILLS_COLUMN]),
+                              version=version)
+        # Memory-mapped artifacts from `job_recommender.py --build` when they match the data
+        recommender.build_or_load()
         return recommender
     except:
         return None
 
 
-def parse_skills(field):
-    """Parse skills field"""
-    if pd.isna(field):
-        return []
-    if isinstance(field, list):
-        return field
-    try:
-        return ast.literal_eval(field)
-    except:
-        return []
-
-
 def format_salary(salary):
     """Format salary display"""
     if pd.isna(salary):
@@ -228,7 +260,7 @@ def create_metric_card(label, value, icon="📊"):
 
 def display_job_card(job, show_match=False):
     """Display a job card"""
-    skills = parse_skills(job.get('array_skills', '[]'))
+    skills = parse_list(job.get('array_skills'))
     skills_html = ''.join([f'<span class="skill-tag">{s}</span>' for s in skills[:8]])
     
     match_html = ""
@@ -267,8 +299,11 @@ def main():
     
     # Load data
     with st.spinner("🔄 Đang tải dữ liệu..."):
-        df = load_data()
-        recommender = load_recommender()
+        version = data_version()
+        df = load_data(version)
+        skill_matrix = load_skill_matrix(version)
+        cube = load_cube(version)
+        recommender = load_recommender(version)
     
     # Sidebar
     st.sidebar.image("https://img.icons8.com/fluency/96/analytics.png", width=80)
@@ -285,39 +320,38 @@ def main():
     
     # Filters
     with st.sidebar.expander("🔍 Tùy chọn lọc", expanded=True):
-        job_groups = ['All'] + sorted(df['job_group'].unique().tolist())
+        job_groups = ['All'] + cube.members('job_group')
         selected_job_group = st.selectbox("Nhóm nghề", job_groups, key="job_group")
         
-        levels = ['All'] + sorted(df['level'].unique().tolist())
+        levels = ['All'] + cube.members('level')
         selected_level = st.selectbox("Cấp độ kinh nghiệm", levels, key="level")
         
-        cities = ['All'] + sorted(df['city'].unique().tolist())
+        cities = ['All'] + cube.members('city')
         selected_city = st.selectbox("Thành phố", cities, key="city")
+        
+        months = ['All'] + cube.members('month')
+        selected_month = st.selectbox("Tháng đăng tuyển", months, key="month")
     
-    # Apply filters
-    filtered_df = df.copy()
-    if selected_job_group != 'All':
-        filtered_df = filtered_df[filtered_df['job_group'] == selected_job_group]
-    if selected_level != 'All':
-        filtered_df = filtered_df[filtered_df['level'] == selected_level]
-    if selected_city != 'All':
-        filtered_df = filtered_df[filtered_df['city'] == selected_city]
+    # Apply filters: select cube cells, postings are only looked up when a page needs them
+    filtered_cube = cube.where(job_group=selected_job_group, level=selected_level,
+                               city=selected_city, month=selected_month)
     
     # Page routing
     if page == "🏠 Tổng quan":
-        show_overview(df, filtered_df)
+        show_overview(filtered_cube)
     elif page == "📊 Phân tích thị trường":
-        show_market_analysis(filtered_df)
+        show_market_analysis(filtered_cube)
     elif page == "🔍 Gợi ý việc làm":
         show_job_recommendations(df, recommender)
     elif page == "💰 Phân tích lương":
-        show_salary_insights(filtered_df)
+        show_salary_insights(filtered_cube)
     elif page == "🎓 Phân tích kỹ năng":
-        show_skills_analysis(filtered_df)
+        filtered_df = df[df.index.isin(filtered_cube.rows())]
+        show_skills_analysis(filtered_df, skill_matrix)
     elif page == "🎬 Kịch bản Demo":
         show_demo_scenarios(df, recommender)
     elif page == "🚀 Mô phỏng lộ trình":
-        show_career_simulator(df)
+        show_career_simulator(df, cube)
     elif page == "⚖️ Công cụ so sánh":
         show_compare_tool(df)
     elif page == "📥 Xuất báo cáo":
@@ -326,25 +360,26 @@ def main():
         show_chatbot(df)
 
 
-def show_overview(df, filtered_df):
+def show_overview(cube):
     """Overview page"""
     st.markdown('<h2 class="sub-header">📊 Tổng quan thị trường</h2>', unsafe_allow_html=True)
     
     # Key metrics
+    summary = cube.summary()
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.markdown(create_metric_card("Tổng số việc", f"{len(filtered_df):,}", "💼"), unsafe_allow_html=True)
+        st.markdown(create_metric_card("Tổng số việc", f"{int(summary['count']):,}", "💼"), unsafe_allow_html=True)
     
     with col2:
-        st.markdown(create_metric_card("Công ty", f"{filtered_df['company_names'].nunique():,}", "🏢"), unsafe_allow_html=True)
+        st.markdown(create_metric_card("Công ty", f"{int(summary['companies']):,}", "🏢"), unsafe_allow_html=True)
     
     with col3:
-        avg_salary = filtered_df['salary_numeric'].mean() / 1_000_000
+        avg_salary = summary['mean'] / 1_000_000
         st.markdown(create_metric_card("Lương TB", f"{avg_salary:.1f}M", "💰"), unsafe_allow_html=True)
     
     with col4:
-        st.markdown(create_metric_card("Thành phố", f"{filtered_df['city'].nunique()}", "📍"), unsafe_allow_html=True)
+        st.markdown(create_metric_card("Thành phố", f"{len(cube.members('city'))}", "📍"), unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -353,7 +388,7 @@ def show_overview(df, filtered_df):
     
     with col1:
         st.markdown("### 🎯 Việc theo nhóm nghề")
-        job_dist = filtered_df['job_group'].value_counts().head(10)
+        job_dist = cube.rollup('job_group')['count'].sort_values(ascending=False, kind='stable').head(10)
         fig = px.bar(
             x=job_dist.values, 
             y=job_dist.index,
@@ -367,7 +402,7 @@ def show_overview(df, filtered_df):
     
     with col2:
         st.markdown("### 📊 Cấp độ kinh nghiệm")
-        level_dist = filtered_df['level'].value_counts()
+        level_dist = cube.rollup('level')['count'].sort_values(ascending=False, kind='stable')
         fig = px.pie(
             values=level_dist.values,
             names=level_dist.index,
@@ -383,7 +418,7 @@ def show_overview(df, filtered_df):
     
     with col1:
         st.markdown("### 📍 Phân bố địa lý")
-        city_dist = filtered_df['city'].value_counts().head(10)
+        city_dist = cube.rollup('city')['count'].sort_values(ascending=False, kind='stable').head(10)
         fig = px.bar(
             x=city_dist.index,
             y=city_dist.values,
@@ -396,26 +431,24 @@ def show_overview(df, filtered_df):
     
     with col2:
         st.markdown("### 💰 Phân bố lương")
-        salary_data = filtered_df[filtered_df['salary_numeric'].notna()]['salary_numeric'] / 1_000_000
-        fig = px.histogram(
-            salary_data,
-            nbins=30,
-            labels={'value': 'Lương (triệu VND)', 'count': 'Tần suất'},
+        salary_hist = cube.salary_histogram(bins=30)
+        fig = px.bar(
+            x=salary_hist.index / 1_000_000,
+            y=salary_hist.values,
+            labels={'x': 'Lương (triệu VND)', 'y': 'Tần suất'},
             color_discrete_sequence=['#667eea']
         )
-        fig.update_layout(showlegend=False, height=400)
+        fig.update_layout(showlegend=False, height=400, bargap=0)
         st.plotly_chart(fig, use_container_width=True)
 
 
-def show_market_analysis(filtered_df):
+def show_market_analysis(cube):
     """Market analysis page"""
     st.markdown('<h2 class="sub-header">📊 Xu hướng & phân tích thị trường</h2>', unsafe_allow_html=True)
     
     # Salary by job group
     st.markdown("### 💰 Lương theo nhóm nghề")
-    salary_by_group = filtered_df[filtered_df['salary_numeric'].notna()].groupby('job_group').agg({
-        'salary_numeric': ['mean', 'median', 'count']
-    }).reset_index()
+    salary_by_group = cube.rollup('job_group')[['mean', 'median', 'salary_count']].reset_index()
     salary_by_group.columns = ['Job Group', 'Mean Salary', 'Median Salary', 'Count']
     salary_by_group = salary_by_group[salary_by_group['Count'] >= 5].sort_values('Mean Salary', ascending=False)
     
@@ -446,7 +479,7 @@ def show_market_analysis(filtered_df):
     
     with col1:
         st.markdown("### 📊 Lương theo cấp độ")
-        salary_by_level = filtered_df[filtered_df['salary_numeric'].notna()].groupby('level')['salary_numeric'].mean().sort_values(ascending=False)
+        salary_by_level = cube.rollup('level')['mean'].dropna().sort_values(ascending=False)
         fig = px.bar(
             x=salary_by_level.index,
             y=salary_by_level.values / 1_000_000,
@@ -459,7 +492,7 @@ def show_market_analysis(filtered_df):
     
     with col2:
         st.markdown("### 🏢 Công ty tuyển nhiều")
-        top_companies = filtered_df['company_names'].value_counts().head(10)
+        top_companies = cube.top_companies(10)
         fig = px.bar(
             x=top_companies.values,
             y=top_companies.index,
@@ -492,10 +525,7 @@ def show_job_recommendations(df, recommender):
     
     with col1:
         # Skills input
-        all_skills = set()
-        for idx, row in df.iterrows():
-            skills = parse_skills(row.get('array_skills', '[]'))
-            all_skills.update([s.lower() for s in skills])
+        all_skills = set(count_skills(get_skills(df)))
         
         popular_skills = ['python', 'javascript', 'java', 'react', 'nodejs', 'docker', 
                          'kubernetes', 'aws', 'sql', 'mongodb', 'django', 'spring']
@@ -560,7 +590,7 @@ def show_job_recommendations(df, recommender):
                 display_job_card(job, show_match=True)
 
 
-def show_salary_insights(filtered_df):
+def show_salary_insights(cube):
     """Salary insights page"""
     st.markdown('<h2 class="sub-header">💰 Phân tích lương & ước tính</h2>', unsafe_allow_html=True)
     
@@ -570,25 +600,20 @@ def show_salary_insights(filtered_df):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        calc_job_group = st.selectbox("Nhóm nghề", filtered_df['job_group'].unique())
+        calc_job_group = st.selectbox("Nhóm nghề", cube.members('job_group'))
     with col2:
-        calc_level = st.selectbox("Cấp độ", filtered_df['level'].unique())
+        calc_level = st.selectbox("Cấp độ", cube.members('level'))
     with col3:
-        calc_city = st.selectbox("Thành phố", filtered_df['city'].unique())
+        calc_city = st.selectbox("Thành phố", cube.members('city'))
     
     # Calculate salary range
-    calc_df = filtered_df[
-        (filtered_df['job_group'] == calc_job_group) &
-        (filtered_df['level'] == calc_level) &
-        (filtered_df['city'] == calc_city) &
-        (filtered_df['salary_numeric'].notna())
-    ]
-    
-    if len(calc_df) > 0:
-        min_sal = calc_df['salary_numeric'].min() / 1_000_000
-        max_sal = calc_df['salary_numeric'].max() / 1_000_000
-        avg_sal = calc_df['salary_numeric'].mean() / 1_000_000
-        median_sal = calc_df['salary_numeric'].median() / 1_000_000
+    calc = cube.where(job_group=calc_job_group, level=calc_level, city=calc_city).summary()
+    
+    if calc['salary_count'] > 0:
+        min_sal = calc['min'] / 1_000_000
+        max_sal = calc['max'] / 1_000_000
+        avg_sal = calc['mean'] / 1_000_000
+        median_sal = calc['median'] / 1_000_000
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -603,7 +628,13 @@ def show_salary_insights(filtered_df):
         # Salary range visualization
         fig = go.Figure()
         fig.add_trace(go.Box(
-            y=calc_df['salary_numeric'] / 1_000_000,
+            q1=[calc['p25'] / 1_000_000],
+            median=[median_sal],
+            q3=[calc['p75'] / 1_000_000],
+            lowerfence=[min_sal],
+            upperfence=[max_sal],
+            mean=[avg_sal],
+            sd=[np.nan_to_num(calc['std']) / 1_000_000],
             name='Salary Range',
             marker_color='#667eea',
             boxmean='sd'
@@ -624,8 +655,8 @@ def show_salary_insights(filtered_df):
     tab1, tab2, tab3 = st.tabs(["Theo nhóm nghề", "Theo cấp độ", "Theo thành phố"])
     
     with tab1:
-        salary_by_group = filtered_df[filtered_df['salary_numeric'].notna()].groupby('job_group')['salary_numeric'].agg(['mean', 'median', 'count'])
-        salary_by_group = salary_by_group[salary_by_group['count'] >= 3].sort_values('mean', ascending=False)
+        salary_by_group = cube.rollup('job_group')
+        salary_by_group = salary_by_group[salary_by_group['salary_count'] >= 3].sort_values('mean', ascending=False)
         
         fig = px.bar(
             salary_by_group,
@@ -641,7 +672,7 @@ def show_salary_insights(filtered_df):
         st.plotly_chart(fig, use_container_width=True)
     
     with tab2:
-        salary_by_level = filtered_df[filtered_df['salary_numeric'].notna()].groupby('level')['salary_numeric'].mean()
+        salary_by_level = cube.rollup('level')['mean'].dropna()
         fig = px.bar(
             x=salary_by_level.index,
             y=salary_by_level.values / 1_000_000,
@@ -653,7 +684,7 @@ def show_salary_insights(filtered_df):
         st.plotly_chart(fig, use_container_width=True)
     
     with tab3:
-        salary_by_city = filtered_df[filtered_df['salary_numeric'].notna()].groupby('city')['salary_numeric'].mean().sort_values(ascending=False)
+        salary_by_city = cube.rollup('city')['mean'].dropna().sort_values(ascending=False)
         fig = px.bar(
             x=salary_by_city.index,
             y=salary_by_city.values / 1_000_000,
@@ -665,17 +696,12 @@ def show_salary_insights(filtered_df):
         st.plotly_chart(fig, use_container_width=True)
 
 
-def show_skills_analysis(filtered_df):
+def show_skills_analysis(filtered_df, skill_matrix):
     """Skills analysis page"""
     st.markdown('<h2 class="sub-header">🎓 Phân tích kỹ năng</h2>', unsafe_allow_html=True)
     
-    # Extract all skills
-    all_skills = []
-    for idx, row in filtered_df.iterrows():
-        skills = parse_skills(row.get('array_skills', '[]'))
-        all_skills.extend([s.lower() for s in skills])
-    
-    skill_counts = pd.Series(all_skills).value_counts()
+    # Count all skills of the filtered rows
+    skill_counts = skill_matrix.skill_counts(filtered_df.index)
     
     # Top skills
     col1, col2 = st.columns(2)
@@ -742,21 +768,27 @@ def show_skills_analysis(filtered_df):
     
     st.info("💡 Các kỹ năng thường xuất hiện cùng nhau trong tin tuyển dụng")
     
-    # Find common pairs (simplified)
-    from itertools import combinations
-    pairs = []
-    for idx, row in filtered_df.head(200).iterrows():
-        skills = parse_skills(row.get('array_skills', '[]'))
-        skills_lower = [s.lower() for s in skills]
-        for pair in combinations(skills_lower, 2):
-            pairs.append(tuple(sorted(pair)))
-    
-    pair_counts = pd.Series(pairs).value_counts().head(15)
-    
-    pair_df = pd.DataFrame([
-        {'Kỹ năng 1': pair[0].capitalize(), 'Kỹ năng 2': pair[1].capitalize(), 'Số lượng': count}
-        for pair, count in pair_counts.items()
-    ])
+    metric_labels = {
+        'count': 'Số lần xuất hiện',
+        'lift': 'Lift',
+        'jaccard': 'Jaccard',
+        'pmi': 'PMI',
+    }
+    metric = st.selectbox("Xếp hạng theo", list(metric_labels), format_func=metric_labels.get)
+    
+    # Co-occurrence over all filtered jobs (rare pairs skew normalized scores)
+    pairs = skill_matrix.top_pairs(
+        filtered_df.index, top_n=15, metric=metric,
+        min_count=1 if metric == 'count' else 5
+    )
+    
+    pair_df = pd.DataFrame({
+        'Kỹ năng 1': pairs['skill_1'].str.capitalize(),
+        'Kỹ năng 2': pairs['skill_2'].str.capitalize(),
+        'Số lượng': pairs['count'],
+    })
+    if metric != 'count':
+        pair_df[metric_labels[metric]] = pairs[metric].round(3)
     
     st.dataframe(pair_df, use_container_width=True, hide_index=True)
 
@@ -5,6 +5,7 @@ Các kịch bản demo có sẵn để trình bày
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+from src.data_processing.skills import get_skills, count_skills
 
 
 def show_demo_scenarios(df, recommender):
@@ -214,18 +215,8 @@ def demo_recruiter(df):
     st.markdown("---")
     st.markdown("#### 🏆 Top kỹ năng được yêu cầu:")
     
-    # Extract skills
-    all_skills = []
-    for idx, row in df.iterrows():
-        try:
-            import ast
-            skills = ast.literal_eval(str(row.get('array_skills', '[]')))
-            if isinstance(skills, list):
-                all_skills.extend([s.lower() for s in skills if s])
-        except:
-            pass
-    
-    skill_counts = pd.Series(all_skills).value_counts().head(15)
+    # Count skills
+    skill_counts = pd.Series(dict(count_skills(get_skills(df)).most_common(15)))
     
     col1, col2 = st.columns([2, 1])
     
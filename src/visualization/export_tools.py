@@ -6,6 +6,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import io
+from src.data_processing.skills import get_skills, count_skills
 
 
 def show_export_tools(df):
@@ -189,7 +190,7 @@ def generate_overview_report(df):
         content.append(f"- {job}: {count:,} ({pct:.1f}%)")
     
     content.append("\n### Phân bố theo cấp độ\n")
-    level_dist = df['level'].value_counts()
+    level_dist = df['level'].value_counts().loc[lambda counts: counts > 0]
     for level, count in level_dist.items():
         pct = (count / len(df)) * 100
         content.append(f"- {level.capitalize()}: {count:,} ({pct:.1f}%)")
@@ -218,14 +219,14 @@ def generate_salary_report(df):
     content.append(f"**Lương cao nhất:** {salary_data.max()/1_000_000:.1f}M VND\n")
     
     content.append("### Lương theo nhóm nghề\n")
-    salary_by_group = df[df['salary_numeric'].notna()].groupby('job_group')['salary_numeric'].agg(['mean', 'count'])
+    salary_by_group = df[df['salary_numeric'].notna()].groupby('job_group', observed=True)['salary_numeric'].agg(['mean', 'count'])
     salary_by_group = salary_by_group[salary_by_group['count'] >= 5].sort_values('mean', ascending=False)
     
     for job, row in salary_by_group.head(10).iterrows():
         content.append(f"- {job}: {row['mean']/1_000_000:.1f}M VND ({int(row['count'])} mẫu)")
     
     content.append("\n### Lương theo cấp độ\n")
-    salary_by_level = df[df['salary_numeric'].notna()].groupby('level')['salary_numeric'].mean().sort_values(ascending=False)
+    salary_by_level = df[df['salary_numeric'].notna()].groupby('level', observed=True)['salary_numeric'].mean().sort_values(ascending=False)
     
     for level, salary in salary_by_level.items():
         content.append(f"- {level.capitalize()}: {salary/1_000_000:.1f}M VND")
@@ -235,23 +236,11 @@ def generate_salary_report(df):
 
 def generate_skills_report(df):
     """Generate skills report content"""
-    import ast
-    from collections import Counter
-    
     content = []
     content.append("## PHÂN TÍCH KỸ NĂNG\n")
     
-    # Extract all skills
-    all_skills = []
-    for _, row in df.iterrows():
-        try:
-            skills = ast.literal_eval(str(row.get('array_skills', '[]')))
-            if isinstance(skills, list):
-                all_skills.extend([s.lower() for s in skills if s])
-        except:
-            pass
-    
-    skill_counts = Counter(all_skills)
+    # Count all skills
+    skill_counts = count_skills(get_skills(df))
     
     content.append(f"**Tổng số kỹ năng:** {len(skill_counts)}")
     content.append(f"**Kỹ năng xuất hiện nhiều nhất:** {skill_counts.most_common(1)[0][0]}\n")